@@ -1,37 +1,108 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g, stream_with_context, has_request_context, send_from_directory, send_file
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
+from flask_sqlalchemy.session import Session as FlaskSession
 from flask_mail import Mail, Message
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_wtf.csrf import CSRFProtect
 import pyotp
-import qrcode
 import io
 import base64
 from datetime import datetime, timedelta
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired, BadSignature
 from functools import wraps
 import os
+import sys
 from dotenv import load_dotenv
 import json
 import uuid
-from flask_cors import CORS
+from flask_cors import CORS, cross_origin
+import click
+import urllib.request
+import urllib.error
+import urllib.parse
+import socket
+import ipaddress
+from markupsafe import escape, Markup
+from jinja2 import FileSystemBytecodeCache
+from flask_wtf.csrf import generate_csrf
+from concurrent.futures import ProcessPoolExecutor, Future
+import password_hashing
+import rate_limit_storage  # registers the sqlite:// storage scheme for Flask-Limiter
+import session_store
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import load_only, defer, selectinload, make_transient_to_detached
+import hashlib
+import threading
+import time
+import math
+import re
+import unicodedata
+import bisect
+import collections
+import hmac
+from contextlib import contextmanager
+import gzip
+import sqlite3
+import mimetypes
+from werkzeug.security import safe_join
+from werkzeug.exceptions import ServiceUnavailable
+import multiprocessing
+try:
+    import brotli
+except ImportError:  # Optional; responses fall back to gzip
+    brotli = None
 
 # Add this after your imports in app.py
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+
+# Translation catalogue: lang -> (mtime, {key: text}), loaded once at startup
+_translations = {}
+
+def load_translations():
+    for filename in os.listdir(LOCALES_DIR):
+        if filename.endswith('.json'):
+            load_locale(filename[:-len('.json')])
+
+def load_locale(lang):
+    file_path = os.path.join(LOCALES_DIR, f'{lang}.json')
+    try:
+        mtime = os.stat(file_path).st_mtime_ns
+        with open(file_path, 'r', encoding='utf-8') as f:
+            _translations[lang] = (mtime, json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"Locale error ({lang}): {e}")
+        _translations[lang] = (None, {})
+    return _translations[lang][1]
+
+def get_translations(lang):
+    entry = _translations.get(lang)
+    if entry is None:
+        return load_locale(lang) if lang.isalnum() else {}
+    # Pick up edits to the locale files without a restart while debugging
+    if app.debug:
+        try:
+            if os.stat(os.path.join(LOCALES_DIR, f'{lang}.json')).st_mtime_ns != entry[0]:
+                return load_locale(lang)
+        except OSError:
+            pass
+    return entry[1]
+
 def get_locale():
     # Check if language is stored in session
     return session.get('language', 'en')
 
 def get_text(key):
-    lang = get_locale()
-    file_path = f'locales/{lang}.json'
-    
-    if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as f:
-            translations = json.load(f)
-            return translations.get(key, key)
-    return key
+    return get_translations(get_locale()).get(key, key)
+
+def get_translator():
+    # Bind the current language's catalogue once per request
+    translator = g.get('translator')
+    if translator is None:
+        translations = get_translations(get_locale())
+        translator = g.translator = lambda key: translations.get(key, key)
+    return translator
 
 load_dotenv()
 
@@ -45,6 +116,33 @@ app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///use
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 app.config['WTF_CSRF_ENABLED'] = False
+app.config['USER_CACHE_TTL'] = int(os.getenv('USER_CACHE_TTL', 0))  # seconds, 0 disables
+app.config['DATA_JSON_MAX_AGE'] = int(os.getenv('DATA_JSON_MAX_AGE', 60))
+app.config['DETAILS_CACHE_TTL'] = int(os.getenv('DETAILS_CACHE_TTL', 3600))  # seconds before revalidating
+app.config['DETAILS_CACHE_MAX_ENTRIES'] = int(os.getenv('DETAILS_CACHE_MAX_ENTRIES', 256))
+app.config['DETAILS_ALLOWED_HOSTS'] = os.getenv('DETAILS_ALLOWED_HOSTS', 'github.com,raw.githubusercontent.com').split(',')
+# Origins of the static portfolio, allowed to call the public JSON/HTML endpoints from the browser
+app.config['PUBLIC_SITE_ORIGINS'] = os.getenv('PUBLIC_SITE_ORIGINS', 'https://yasserbdj96.github.io').split(',')
+
+# Database engine configuration
+# Pool options apply to every engine. SQLite connections are switched to WAL
+# on connect so readers keep going while a write transaction is open.
+# DATABASE_READ_URL adds a "read" bind (a replica, or the same SQLite file
+# opened read-only) used by the public listing endpoints.
+app.config['SQLITE_JOURNAL_MODE'] = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+app.config['SQLITE_SYNCHRONOUS'] = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+app.config['SQLITE_BUSY_TIMEOUT'] = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # milliseconds
+app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 2**20))  # bytes, 0 disables
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'True') == 'True',
+    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),  # seconds, -1 disables
+}
+if ':memory:' not in app.config['SQLALCHEMY_DATABASE_URI'] and app.config['SQLALCHEMY_DATABASE_URI'] != 'sqlite://':
+    # In-memory SQLite uses a single static connection that takes no pool size
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(
+        pool_size=int(os.getenv('DB_POOL_SIZE', 5)), max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10)))
+if os.getenv('DATABASE_READ_URL'):
+    app.config['SQLALCHEMY_BINDS'] = {'read': os.getenv('DATABASE_READ_URL')}
 
 # Mail configuration
 app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
@@ -54,21 +152,432 @@ app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
 app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER', 'noreply@example.com')
 
+# Rate limiting configuration
+# Counters must be shared by every worker process, otherwise each gunicorn
+# worker enforces its own copy of the limits. Use a redis:// URI to share
+# them across hosts.
+app.config['RATELIMIT_STORAGE_URI'] = os.getenv(
+    'RATELIMIT_STORAGE_URI', 'sqlite:///' + os.path.join(app.instance_path, 'ratelimit.db'))
+app.config['RATELIMIT_STRATEGY'] = os.getenv('RATELIMIT_STRATEGY', 'sliding-window-counter')
+
+# Session configuration
+# The cookie only holds an opaque session id; the data is kept server-side in
+# a store shared by every worker, with an LRU cache of recent sessions in
+# each process.
+app.config['SESSION_STORAGE_URI'] = os.getenv(
+    'SESSION_STORAGE_URI', 'sqlite:///' + os.path.join(app.instance_path, 'sessions.db'))
+app.config['SESSION_CACHE_MAX_ENTRIES'] = int(os.getenv('SESSION_CACHE_MAX_ENTRIES', 1024))
+
+# Password hashing configuration
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+app.config['BCRYPT_WORKERS'] = int(os.getenv('BCRYPT_WORKERS', os.cpu_count() or 1))  # 0 hashes on the request thread
+app.config['BCRYPT_QUEUE_SIZE'] = int(os.getenv('BCRYPT_QUEUE_SIZE', 4 * app.config['BCRYPT_WORKERS'] or 1))
+app.config['BCRYPT_QUEUE_TIMEOUT'] = float(os.getenv('BCRYPT_QUEUE_TIMEOUT', 10))  # seconds before answering 503
+
+# Outbound mail queue configuration
+app.config['MAIL_QUEUE_WORKERS'] = int(os.getenv('MAIL_QUEUE_WORKERS', 2))
+app.config['MAIL_MAX_ATTEMPTS'] = int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+app.config['MAIL_RETRY_BACKOFF'] = int(os.getenv('MAIL_RETRY_BACKOFF', 30))  # seconds, doubled per attempt
+app.config['MAIL_CONNECTION_IDLE'] = int(os.getenv('MAIL_CONNECTION_IDLE', 30))  # seconds
+
+# 2FA configuration
+app.config['TOTP_QR_FORMAT'] = os.getenv('TOTP_QR_FORMAT', 'svg')  # svg or png
+
+# Image variant configuration
+app.config['IMAGE_WORKERS'] = int(os.getenv('IMAGE_WORKERS', 2))  # 0 resizes on the request thread
+app.config['IMAGE_QUALITY'] = int(os.getenv('IMAGE_QUALITY', 75))
+app.config['IMAGE_CACHE_MAX_BYTES'] = int(os.getenv('IMAGE_CACHE_MAX_BYTES', 512 * 2**20))
+app.config['IMAGE_MAX_SOURCE_BYTES'] = int(os.getenv('IMAGE_MAX_SOURCE_BYTES', 20 * 2**20))
+app.config['IMAGE_SOURCE_TTL'] = int(os.getenv('IMAGE_SOURCE_TTL', 86400))  # seconds before revalidating a source
+app.config['IMAGE_ALLOWED_HOSTS'] = os.getenv(
+    'IMAGE_ALLOWED_HOSTS', 'raw.githubusercontent.com,github.com,user-images.githubusercontent.com').split(',')
+
+# GitHub profile stats configuration
+app.config['GITHUB_USERNAME'] = os.getenv('GITHUB_USERNAME', 'yasserbdj96')
+app.config['GITHUB_API_URL'] = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+app.config['GITHUB_TOKEN'] = os.getenv('GITHUB_TOKEN')  # Optional; raises GitHub's rate limit
+app.config['GITHUB_STATS_TTL'] = int(os.getenv('GITHUB_STATS_TTL', 3600))  # seconds between refreshes
+app.config['GITHUB_STATS_RETRY'] = int(os.getenv('GITHUB_STATS_RETRY', 300))  # seconds after a failed refresh
+
+# Template cache configuration
+app.config['PAGE_CACHE_MAX_ENTRIES'] = int(os.getenv('PAGE_CACHE_MAX_ENTRIES', 256))  # 0 disables
+app.config['FRAGMENT_CACHE_MAX_ENTRIES'] = int(os.getenv('FRAGMENT_CACHE_MAX_ENTRIES', 4096))  # 0 disables
+
+# Compression configuration
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # bytes
+app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip, 1-9
+app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))  # 0-11
+
+# Live update stream configuration
+app.config['STREAM_MAX_CLIENTS'] = int(os.getenv('STREAM_MAX_CLIENTS', 1000))  # per worker process
+app.config['STREAM_POLL_INTERVAL'] = float(os.getenv('STREAM_POLL_INTERVAL', 1.0))  # seconds between stamp checks
+app.config['STREAM_HEARTBEAT'] = int(os.getenv('STREAM_HEARTBEAT', 15))  # seconds between keep-alive comments
+# Limits when not running under gevent/eventlet, where each subscriber pins a thread
+app.config['STREAM_THREADED_MAX_CLIENTS'] = int(os.getenv('STREAM_THREADED_MAX_CLIENTS', 2))  # per process, 0 refuses
+app.config['STREAM_THREADED_MAX_DURATION'] = int(os.getenv('STREAM_THREADED_MAX_DURATION', 60))  # seconds per connection
+
+# Metrics configuration
+app.config['SERVER_TIMING'] = os.getenv('SERVER_TIMING', 'False') == 'True'
+app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')  # Bearer token required by /metrics when set
+
+# Database engine
+@event.listens_for(Engine, 'connect')
+def configure_sqlite(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {app.config['SQLITE_BUSY_TIMEOUT']:d}")
+        cursor.execute(f"PRAGMA synchronous = {app.config['SQLITE_SYNCHRONOUS']}")
+        cursor.execute(f"PRAGMA mmap_size = {app.config['SQLITE_MMAP_SIZE']:d}")
+        mode = app.config['SQLITE_JOURNAL_MODE']
+        # The journal mode is stored in the file; only switch it once, and
+        # leave read-only connections alone
+        if cursor.execute('PRAGMA journal_mode').fetchone()[0].lower() != mode.lower():
+            try:
+                cursor.execute(f'PRAGMA journal_mode = {mode}')
+            except sqlite3.OperationalError as e:
+                print(f"Could not set SQLite journal mode to {mode}: {e}")
+    finally:
+        cursor.close()
+
+class RoutingSession(FlaskSession):
+    """Sends reads of read_only views to the "read" bind when one is configured"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context() and g.get('db_read_only')
+                and 'read' in db.engines):
+            return db.engines['read']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def read_only(f):
+    """Serve the view from the read bind; it must not write"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.db_read_only = True
+        return f(*args, **kwargs)
+    return decorated_function
+
 # Initialize extensions
-db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 mail = Mail(app)
 csrf = CSRFProtect(app)
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://"
+    storage_uri=app.config['RATELIMIT_STORAGE_URI'],
+    strategy=app.config['RATELIMIT_STRATEGY']
 )
 
+app.session_interface = session_store.ServerSideSessionInterface(
+    session_store.storage_from_uri(app.config['SESSION_STORAGE_URI']),
+    cache_size=app.config['SESSION_CACHE_MAX_ENTRIES'])
+
+load_translations()
+
 # Token serializer for password reset and email verification
 serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'])
 
+# Request metrics
+# Per-process latency histograms for every endpoint, SQL statements, bcrypt,
+# mail delivery and other slow operations, exported in the Prometheus text
+# format at /metrics. With SERVER_TIMING enabled each response also carries a
+# Server-Timing header breaking its time down the same way.
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_HELP = {
+    'http_request_duration_seconds': ('histogram', 'Time until the response starts, by endpoint'),
+    'http_request_db_queries_total': ('counter', 'SQL statements issued while handling requests'),
+    'http_request_db_seconds_total': ('counter', 'Time spent in SQL statements while handling requests'),
+    'db_query_duration_seconds': ('histogram', 'Duration of each SQL statement'),
+    'operation_duration_seconds': ('histogram', 'Duration of instrumented operations'),
+    'mail_send_duration_seconds': ('histogram', 'SMTP delivery time by result'),
+    'page_cache_total': ('counter', 'Anonymous page requests by page cache result'),
+    'github_stats_refresh_total': ('counter', 'GitHub profile refreshes by result'),
+}
+
+_metrics_lock = threading.Lock()
+_histograms = {}  # (name, labels) -> {'buckets': [...], 'count': n, 'sum': seconds}
+_counters = {}  # (name, labels) -> value
+
+def observe(name, seconds, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _metrics_lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {'buckets': [0] * (len(METRICS_BUCKETS) + 1), 'count': 0, 'sum': 0.0}
+        histogram['buckets'][bisect.bisect_left(METRICS_BUCKETS, seconds)] += 1
+        histogram['count'] += 1
+        histogram['sum'] += seconds
+
+def increment(name, amount=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _metrics_lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def record_timing(operation, seconds):
+    observe('operation_duration_seconds', seconds, operation=operation)
+    if has_request_context():
+        timings = g.setdefault('timings', {})
+        timings[operation] = timings.get(operation, 0.0) + seconds
+
+@contextmanager
+def timed(operation):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(operation, time.perf_counter() - start)
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info['query_started'].pop()
+    observe('db_query_duration_seconds', seconds)
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+        g.db_seconds = g.get('db_seconds', 0.0) + seconds
+
+@event.listens_for(Engine, 'handle_error')
+def discard_query_timer(context):
+    started = context.connection.info.get('query_started') if context.connection is not None else None
+    if started:
+        started.pop()
+
+class MetricsMiddleware:
+    """Time every request, including ones rejected before reaching a view"""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        environ['metrics.start'] = start = time.perf_counter()
+        status = ['500']
+
+        def capture_status(status_line, headers, exc_info=None):
+            status[0] = status_line.split(' ', 1)[0]
+            return start_response(status_line, headers, exc_info)
+
+        try:
+            return self.wsgi_app(environ, capture_status)
+        finally:
+            observe('http_request_duration_seconds', time.perf_counter() - start,
+                    endpoint=environ.get('metrics.endpoint') or 'unmatched',
+                    method=environ.get('REQUEST_METHOD', ''), status=status[0])
+
+app.wsgi_app = MetricsMiddleware(app.wsgi_app)
+
+@app.after_request
+def add_server_timing(response):
+    if app.config['SERVER_TIMING']:
+        entries = []
+        if g.get('db_queries'):
+            entries.append(f'db;dur={g.db_seconds * 1000:.1f};desc="{g.db_queries} queries"')
+        for operation, seconds in g.get('timings', {}).items():
+            entries.append(f'{operation};dur={seconds * 1000:.1f}')
+        start = request.environ.get('metrics.start')
+        if start is not None:
+            entries.append(f'total;dur={(time.perf_counter() - start) * 1000:.1f}')
+        response.headers['Server-Timing'] = ', '.join(entries)
+    return response
+
+@app.teardown_request
+def record_request_queries(exc):
+    endpoint = request.endpoint or 'unmatched'
+    request.environ['metrics.endpoint'] = endpoint
+    if g.get('db_queries'):
+        increment('http_request_db_queries_total', g.db_queries, endpoint=endpoint)
+        increment('http_request_db_seconds_total', g.db_seconds, endpoint=endpoint)
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+def render_metrics(gauges):
+    """Prometheus text exposition of every metric recorded by this process"""
+    with _metrics_lock:
+        histograms = {key: dict(value, buckets=list(value['buckets'])) for key, value in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    for name in sorted({key[0] for key in histograms} | {key[0] for key in counters}):
+        kind, description = METRICS_HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'{name}{format_labels(labels)} {value}')
+        for (metric, labels), histogram in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(METRICS_BUCKETS + ('+Inf',), histogram['buckets']):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {histogram["sum"]}')
+            lines.append(f'{name}_count{format_labels(labels)} {histogram["count"]}')
+    for name, kind, description, samples in gauges:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{name}{format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+# Response compression
+# Text responses are gzip- or brotli-encoded according to Accept-Encoding.
+# /data.json keeps its encoded variants next to the raw snapshot so it is
+# compressed once per content change, and static files are served from the
+# .br/.gz siblings written by `flask precompress` when they are up to date.
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+                          'application/json', 'application/x-ndjson', 'image/svg+xml'}
+PRECOMPRESS_EXTENSIONS = {'.css', '.js', '.json', '.html', '.svg', '.txt', '.xml', '.map'}
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+def available_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def negotiate_encoding():
+    return request.accept_encodings.best_match(available_encodings())
+
+def compress(body, encoding, best=False):
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else app.config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(body, compresslevel=9 if best else app.config['COMPRESS_LEVEL'], mtime=0)
+
+@app.after_request
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None or response.calculate_content_length() < app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    with timed('compress'):
+        response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    # The bytes differ from the identity encoding, so only a weak match remains valid
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def serve_static(filename):
+    encoding = negotiate_encoding()
+    source = safe_join(app.static_folder, filename)
+    if encoding and source and os.path.splitext(filename)[1] in PRECOMPRESS_EXTENSIONS:
+        compressed = source + ENCODING_SUFFIXES[encoding]
+        try:
+            fresh = os.stat(compressed).st_mtime >= os.stat(source).st_mtime
+        except OSError:
+            fresh = False
+        if fresh:
+            response = send_from_directory(app.static_folder, filename + ENCODING_SUFFIXES[encoding],
+                                           mimetype=mimetypes.guess_type(filename)[0],
+                                           max_age=app.get_send_file_max_age(filename))
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            return response
+    response = app.send_static_file(filename)
+    if os.path.splitext(filename)[1] in PRECOMPRESS_EXTENSIONS:
+        response.vary.add('Accept-Encoding')
+    return response
+
+app.view_functions['static'] = serve_static
+
+def precompress_file(path):
+    """Write .br/.gz siblings for path; returns the number of files written"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    source_stat = os.stat(path)
+    written = 0
+    for encoding in available_encodings():
+        target = path + ENCODING_SUFFIXES[encoding]
+        try:
+            if os.stat(target).st_mtime == source_stat.st_mtime:
+                continue
+        except OSError:
+            pass
+        body = compress(raw, encoding, best=True)
+        if len(body) >= len(raw):
+            continue
+        with open(target + '.tmp', 'wb') as f:
+            f.write(body)
+        os.replace(target + '.tmp', target)
+        # Mirror the source mtime so an edited source makes the sibling stale
+        os.utime(target, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        written += 1
+    return written
+
+# Password hashing pool
+# bcrypt is CPU-bound and holds the GIL, so hashes are computed in a process
+# pool sized to the machine. A semaphore bounds how many requests may queue
+# for it; further logins wait up to BCRYPT_QUEUE_TIMEOUT seconds for a slot
+# and then get a 503 instead of piling up in the pool.
+# Pool workers are started from a fresh forkserver process rather than forked
+# from this one: by the time a pool is created the mail, stream and GitHub
+# threads are running, and forking a threaded process can deadlock.
+POOL_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+_password_pool = None
+_password_pool_lock = threading.Lock()
+_password_slots = threading.BoundedSemaphore(app.config['BCRYPT_QUEUE_SIZE'])
+
+password_metrics_lock = threading.Lock()
+password_metrics = {
+    'queue_depth': 0,
+    'max_queue_depth': 0,
+    'hash': {'count': 0, 'seconds_total': 0.0, 'compute_seconds_total': 0.0, 'max_seconds': 0.0},
+    'check': {'count': 0, 'seconds_total': 0.0, 'compute_seconds_total': 0.0, 'max_seconds': 0.0},
+}
+
+def get_password_pool():
+    global _password_pool
+    if _password_pool is None:
+        with _password_pool_lock:
+            if _password_pool is None:
+                _password_pool = ProcessPoolExecutor(max_workers=app.config['BCRYPT_WORKERS'],
+                                                     mp_context=POOL_MP_CONTEXT)
+    return _password_pool
+
+def run_password_task(operation, func, *args):
+    start = time.perf_counter()
+    with password_metrics_lock:
+        password_metrics['queue_depth'] += 1
+        password_metrics['max_queue_depth'] = max(password_metrics['max_queue_depth'],
+                                                  password_metrics['queue_depth'])
+    try:
+        if app.config['BCRYPT_WORKERS'] > 0:
+            if not _password_slots.acquire(timeout=app.config['BCRYPT_QUEUE_TIMEOUT']):
+                raise ServiceUnavailable('Too many logins in progress, please try again shortly.',
+                                         retry_after=5)
+            try:
+                result, compute_seconds = get_password_pool().submit(func, *args).result()
+            finally:
+                _password_slots.release()
+        else:
+            result, compute_seconds = func(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+        with password_metrics_lock:
+            password_metrics['queue_depth'] -= 1
+    record_timing(f'password_{operation}', elapsed)
+    with password_metrics_lock:
+        stats = password_metrics[operation]
+        stats['count'] += 1
+        stats['seconds_total'] += elapsed
+        stats['compute_seconds_total'] += compute_seconds
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+    return result
+
 # User Model
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -81,10 +590,15 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = run_password_task('hash', password_hashing.hash_password,
+                                               password, app.config['BCRYPT_LOG_ROUNDS'])
     
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return run_password_task('check', password_hashing.check_password,
+                                 self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hashing.hash_rounds(self.password_hash) != app.config['BCRYPT_LOG_ROUNDS']
     
     def generate_2fa_secret(self):
         self.two_fa_secret = pyotp.random_base32()
@@ -105,24 +619,83 @@ class Project(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    tech = db.Column(db.Text, nullable=False)  # Stored as comma-separated
+    tech = db.Column(db.Text, nullable=False)  # Comma-separated copy of the tags, kept for older clients
     image = db.Column(db.String(500), nullable=False)
     cover = db.Column(db.String(500), nullable=False)
     source = db.Column(db.String(500), nullable=False)
     details = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    tag_links = db.relationship('ProjectTag', order_by='ProjectTag.position',
+                                cascade='all, delete-orphan', back_populates='project')
+
+    # Matches the newest-first (created_at, id) ordering used by every listing
+    __table_args__ = (db.Index('ix_project_created_at', created_at.desc(), id.desc()),)
+
+    # JSON key -> column, also used to resolve ?fields= projections
+    api_fields = {
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'tech': 'tag_links',
+        'image': 'image',
+        'cover': 'cover',
+        'source': 'source',
+        'details': 'details'
+    }
+
+    # Columns indexed for /api/search: title, summary, body
+    search_fields = ('title', 'description', 'details')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'tech': [t.strip() for t in self.tech.split(',') if t.strip()],
-            'image': self.image,
-            'cover': self.cover,
-            'source': self.source,
-            'details': self.details
-        }
+    def to_dict(self, fields=None):
+        data = {key: getattr(self, column) for key, column in self.api_fields.items()
+                if fields is None or key in fields}
+        if 'tech' in data:
+            data['tech'] = [link.tag.name for link in data['tech']]
+        return data
+
+    @staticmethod
+    def tech_names(tech):
+        names = tech if isinstance(tech, list) else tech.split(',')
+        return list(dict.fromkeys(name.strip() for name in names if name.strip()))
+
+    def set_tech(self, tech, tags=None):
+        """Set the project's tags from a list or a comma-separated string"""
+        names = self.tech_names(tech)
+        self.tech = ','.join(names)
+
+        if tags is None:
+            tags = Tag.get_or_create(names)
+        existing = {link.tag.name: link for link in self.tag_links}
+        links = []
+        for position, name in enumerate(names):
+            link = existing.pop(name, None) or ProjectTag(tag=tags[name])
+            link.position = position
+            links.append(link)
+        self.tag_links = links
+
+# Tag Model (normalized project technologies)
+class Tag(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    slug = db.Column(db.String(100), nullable=False, index=True)  # Lower-cased name for lookups
+
+    @staticmethod
+    def get_or_create(names):
+        tags = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(names)).all()} if names else {}
+        for name in names:
+            if name not in tags:
+                tags[name] = Tag(name=name, slug=name.lower())
+                db.session.add(tags[name])
+        return tags
+
+class ProjectTag(db.Model):
+    __tablename__ = 'project_tag'
+    project_id = db.Column(db.String(36), db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tag.id', ondelete='CASCADE'), primary_key=True, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    project = db.relationship('Project', back_populates='tag_links')
+    tag = db.relationship('Tag', lazy='joined')
 
 # BlogPost Model
 class BlogPost(db.Model):
@@ -136,77 +709,1226 @@ class BlogPost(db.Model):
     read_time = db.Column(db.String(50), nullable=False)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_blog_post_created_at', created_at.desc(), id.desc()),
+        db.Index('ix_blog_post_category_created_at', category, created_at.desc(), id.desc()),
+    )
+
+    # JSON key -> column, also used to resolve ?fields= projections
+    api_fields = {
+        'id': 'id',
+        'title': 'title',
+        'excerpt': 'excerpt',
+        'date': 'date',
+        'category': 'category',
+        'image': 'image',
+        'cover': 'cover',
+        'readTime': 'read_time',
+        'content': 'content'
+    }
+
+    # Columns indexed for /api/search: title, summary, body
+    search_fields = ('title', 'excerpt', 'content')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'excerpt': self.excerpt,
-            'date': self.date,
-            'category': self.category,
-            'image': self.image,
-            'cover': self.cover,
-            'readTime': self.read_time,
-            'content': self.content
-        }
-
-# Create tables
-with app.app_context():
-    db.create_all()
+    def to_dict(self, fields=None):
+        return {key: getattr(self, column) for key, column in self.api_fields.items()
+                if fields is None or key in fields}
+
+# Mail Outbox Model (durable spool for queued mail)
+class MailOutbox(db.Model):
+    __tablename__ = 'mail_outbox'
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(255), nullable=True)
+    recipients = db.Column(db.Text, nullable=False)  # Stored as JSON list
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.Index('ix_mail_outbox_due', 'status', 'next_attempt_at'),)
+
+    def to_message(self):
+        return Message(subject=self.subject,
+                       sender=self.sender,
+                       recipients=json.loads(self.recipients),
+                       body=self.body)
+
+# Search Posting Model (inverted index used when SQLite FTS5 is unavailable)
+class SearchPosting(db.Model):
+    __tablename__ = 'search_posting'
+    term = db.Column(db.String(64), primary_key=True)
+    kind = db.Column(db.String(10), primary_key=True)
+    entry_id = db.Column(db.String(36), primary_key=True)
+    weight = db.Column(db.Float, nullable=False)  # Field-weighted term frequency
+
+    __table_args__ = (db.Index('ix_search_posting_entry', 'kind', 'entry_id'),)
+
+# Change Log Model (feed of created, updated and deleted entries)
+class ChangeLog(db.Model):
+    __tablename__ = 'change_log'
+    # Sequence number and /api/changes cursor; AUTOINCREMENT so SQLite never reuses one
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)
+    entry_id = db.Column(db.String(36), nullable=False)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Only the latest change of each entry is kept
+    __table_args__ = (db.Index('ix_change_log_entry', 'kind', 'entry_id', unique=True),
+                      {'sqlite_autoincrement': True})
+
+# Content version tracking
+# A stamp file in the instance folder gets a new random token whenever a
+# Project or BlogPost write commits, so every worker process can tell that its
+# cached copy of the catalogue is stale by reading a few bytes. The token is
+# compared rather than the file's mtime, which some filesystems only keep to
+# the second.
+CONTENT_MODELS = (Project, BlogPost, ProjectTag)
+os.makedirs(app.instance_path, exist_ok=True)
+CONTENT_VERSION_FILE = os.path.join(app.instance_path, 'content.version')
+
+def get_content_version():
+    try:
+        with open(CONTENT_VERSION_FILE, 'r', encoding='ascii') as f:
+            return f.read()
+    except OSError:
+        return ''
+
+def bump_content_version():
+    # Written under a temporary name and renamed, so readers never see a partial token
+    tmp_path = f'{CONTENT_VERSION_FILE}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='ascii') as f:
+        f.write(uuid.uuid4().hex)
+    os.replace(tmp_path, CONTENT_VERSION_FILE)
+
+@event.listens_for(db.session, 'after_flush')
+def track_content_changes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, CONTENT_MODELS):
+            session.info['content_changed'] = True
+            return
+
+@event.listens_for(db.session, 'after_commit')
+def publish_content_changes(session):
+    if session.info.pop('content_changed', False):
+        bump_content_version()
+        stream_hub.wake()
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_content_changes(session):
+    session.info.pop('content_changed', None)
+
+# Serialized /data.json snapshot, rebuilt only when the content version changes
+_data_snapshot = None  # (version, body, etag)
+_data_snapshot_lock = threading.Lock()
+
+def build_data_snapshot():
+    projects = Project.query.options(*entry_load_options(Project)).order_by(Project.created_at.desc()).all()
+    blog_posts = BlogPost.query.order_by(BlogPost.created_at.desc()).all()
+
+    data = {
+        'projects': [project.to_dict() for project in projects],
+        'blogPosts': [post.to_dict() for post in blog_posts]
+    }
+
+    body = (app.json.dumps(data) + '\n').encode('utf-8')
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+def get_data_snapshot():
+    global _data_snapshot
+    version = get_content_version()
+    snapshot = _data_snapshot
+    if snapshot is not None and snapshot[0] == version:
+        return snapshot
+
+    with _data_snapshot_lock:
+        if _data_snapshot is None or _data_snapshot[0] != version:
+            with timed('data_snapshot'):
+                body, etag = build_data_snapshot()
+            _data_snapshot = (version, body, etag)
+        return _data_snapshot
+
+_encoded_snapshots = {}  # encoding -> (version, compressed body)
+
+def get_encoded_snapshot(version, body, encoding):
+    cached = _encoded_snapshots.get(encoding)
+    if cached is None or cached[0] != version:
+        with timed('compress'):
+            cached = _encoded_snapshots[encoding] = (version, compress(body, encoding, best=True))
+    return cached[1]
+
+# Full-text search
+# Projects and blog posts are indexed on their title, summary and body. On
+# SQLite the index is an FTS5 table ranked with bm25(); other databases use
+# the search_posting inverted index, scored here with field-weighted tf-idf.
+# Either way the index is updated after each flush, in the same transaction
+# as the entries themselves.
+SEARCH_TABLE = 'search_index'
+SEARCH_KINDS = {'project': Project, 'blog': BlogPost}
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0)  # title, summary, body
+SEARCH_MAX_TERMS = 8
+SEARCH_PREFIX_EXPANSIONS = 50
+SNIPPET_TOKENS = 16
+SNIPPET_START, SNIPPET_END = '\x02', '\x03'  # Replaced by <mark> after escaping
+
+_search_backend = None
+_search_word = re.compile(r'[^\W_]+')
+
+def search_backend():
+    global _search_backend
+    if _search_backend is None:
+        backend = 'postings'
+        if db.engine.dialect.name == 'sqlite':
+            with db.engine.connect() as conn:
+                if 'ENABLE_FTS5' in {row[0] for row in conn.exec_driver_sql('PRAGMA compile_options')}:
+                    backend = 'fts5'
+        _search_backend = backend
+    return _search_backend
+
+def search_kind(model):
+    return next(kind for kind, kind_model in SEARCH_KINDS.items() if kind_model is model)
+
+def normalize_term(word):
+    # Same folding as FTS5's unicode61 tokenizer with remove_diacritics
+    word = unicodedata.normalize('NFKD', word.lower())
+    return ''.join(ch for ch in word if not unicodedata.combining(ch))[:64]
+
+def search_terms(text):
+    return [normalize_term(word) for word in _search_word.findall(text or '')]
+
+def search_rowid(kind, entry_id):
+    # Stable FTS5 rowid for an entry, so updates and deletes are rowid lookups
+    return int.from_bytes(hashlib.sha1(f'{kind}:{entry_id}'.encode('utf-8')).digest()[:8], 'big') >> 1
+
+def init_search_index():
+    if search_backend() == 'fts5':
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+                'kind UNINDEXED, entry_id UNINDEXED, title, summary, body, '
+                "tokenize='unicode61 remove_diacritics 2')")
+            empty = conn.exec_driver_sql(f'SELECT 1 FROM {SEARCH_TABLE} LIMIT 1').first() is None
+    else:
+        empty = SearchPosting.query.first() is None
+    if empty and any(model.query.first() is not None for model in SEARCH_KINDS.values()):
+        rebuild_search_index()
+
+def unindex_entries(connection, model, ids):
+    kind = search_kind(model)
+    if search_backend() == 'fts5':
+        connection.execute(db.text(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid'),
+                           [{'rowid': search_rowid(kind, entry_id)} for entry_id in ids])
+    else:
+        connection.execute(db.delete(SearchPosting).where(SearchPosting.kind == kind,
+                                                          SearchPosting.entry_id.in_(list(ids))))
+
+def reindex_entries(connection, model, ids):
+    """Re-read the given entries and replace their index rows"""
+    ids = list(ids)
+    if not ids:
+        return
+    kind = search_kind(model)
+    columns = [model.__table__.c[name] for name in model.search_fields]
+    rows = connection.execute(db.select(model.__table__.c.id, *columns)
+                              .where(model.__table__.c.id.in_(ids))).all()
+    unindex_entries(connection, model, ids)
+    if not rows:
+        return
+
+    if search_backend() == 'fts5':
+        connection.execute(
+            db.text(f'INSERT INTO {SEARCH_TABLE} (rowid, kind, entry_id, title, summary, body) '
+                    'VALUES (:rowid, :kind, :entry_id, :title, :summary, :body)'),
+            [{'rowid': search_rowid(kind, entry_id), 'kind': kind, 'entry_id': entry_id,
+              'title': title, 'summary': summary, 'body': body}
+             for entry_id, title, summary, body in rows])
+        return
+
+    postings = []
+    for entry_id, *fields in rows:
+        weights = {}
+        for field_weight, text in zip(SEARCH_WEIGHTS, fields):
+            counts = {}
+            for term in search_terms(text):
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                weights[term] = weights.get(term, 0) + field_weight * (1 + math.log(count))
+        postings.extend({'term': term, 'kind': kind, 'entry_id': entry_id, 'weight': weight}
+                        for term, weight in weights.items())
+    if postings:
+        connection.execute(db.insert(SearchPosting), postings)
+
+def rebuild_search_index():
+    connection = db.session.connection()
+    if search_backend() == 'fts5':
+        connection.exec_driver_sql(f'DELETE FROM {SEARCH_TABLE}')
+    else:
+        connection.execute(db.delete(SearchPosting))
+    for model in SEARCH_KINDS.values():
+        ids = [entry_id for entry_id, in connection.execute(db.select(model.__table__.c.id))]
+        for start in range(0, len(ids), BULK_CHUNK_SIZE):
+            reindex_entries(connection, model, ids[start:start + BULK_CHUNK_SIZE])
+    db.session.commit()
+
+@event.listens_for(db.session, 'after_flush')
+def sync_search_index(session, flush_context):
+    changed, removed = {}, {}
+    for obj in list(session.new) + list(session.dirty):
+        model = type(obj)
+        if model in SEARCH_KINDS.values():
+            state = sa_inspect(obj)
+            if obj in session.new or any(state.attrs[name].history.has_changes() for name in model.search_fields):
+                changed.setdefault(model, set()).add(obj.id)
+    for obj in session.deleted:
+        if type(obj) in SEARCH_KINDS.values():
+            removed.setdefault(type(obj), set()).add(obj.id)
+    if not changed and not removed:
+        return
+    connection = session.connection()
+    for model, ids in removed.items():
+        unindex_entries(connection, model, ids)
+    for model, ids in changed.items():
+        reindex_entries(connection, model, ids)
+
+def render_snippet(text):
+    return str(escape(text)).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+
+def make_snippet(fields, matches):
+    """Highlight the densest run of matching words, like FTS5's snippet()"""
+    best = None
+    for text in reversed(fields):  # Prefer the body, fall back to summary and title
+        words = list(_search_word.finditer(text or ''))
+        hits = [i for i, word in enumerate(words) if matches(normalize_term(word.group()))]
+        if hits and (best is None or len(hits) > len(best[2])):
+            best = (text, words, hits)
+    if best is None:
+        return str(escape(fields[-1][:200]))
+    text, words, hits = best
+    first = max(0, hits[0] - SNIPPET_TOKENS // 4)
+    last = min(len(words), first + SNIPPET_TOKENS) - 1
+    hits = set(hits)
+    parts = ['…' if first else '']
+    position = words[first].start()
+    for i in range(first, last + 1):
+        word = words[i]
+        parts.append(text[position:word.start()])
+        parts.append(SNIPPET_START + word.group() + SNIPPET_END if i in hits else word.group())
+        position = word.end()
+    parts.append('…' if last < len(words) - 1 else '')
+    return render_snippet(''.join(parts))
+
+def search_fts5(terms, kind, limit, offset):
+    query = ' '.join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+    sql = (f'SELECT kind, entry_id, title, '
+           f'snippet({SEARCH_TABLE}, -1, :start, :end, :ellipsis, :tokens), '
+           f'-bm25({SEARCH_TABLE}, 0, 0, {weights}) AS score '
+           f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query'
+           + (' AND kind = :kind' if kind else '') +
+           ' ORDER BY score DESC LIMIT :limit OFFSET :offset')
+    rows = db.session.execute(db.text(sql), {
+        'start': SNIPPET_START, 'end': SNIPPET_END, 'ellipsis': '…', 'tokens': SNIPPET_TOKENS,
+        'query': query, 'kind': kind, 'limit': limit, 'offset': offset})
+    return [{'type': row[0], 'id': row[1], 'title': row[2], 'snippet': render_snippet(row[3]),
+             'score': round(row[4], 4)} for row in rows]
+
+def search_postings(terms, kind, limit, offset):
+    exact, prefix = terms[:-1], terms[-1]
+    # A range rather than LIKE so the primary key index on term is used
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    expansions = [term for term, in db.session.query(SearchPosting.term)
+                  .filter(SearchPosting.term >= prefix, SearchPosting.term < upper)
+                  .distinct().order_by(SearchPosting.term).limit(SEARCH_PREFIX_EXPANSIONS)]
+    if not expansions:
+        return []
+    wanted = set(exact) | set(expansions)
+
+    total = sum(model.query.count() for model in SEARCH_KINDS.values()) or 1
+    document_frequency = dict(db.session.query(SearchPosting.term, db.func.count())
+                              .filter(SearchPosting.term.in_(wanted))
+                              .group_by(SearchPosting.term))
+    idf = db.case({term: math.log(1 + total / document_frequency.get(term, 1)) for term in wanted},
+                  value=SearchPosting.term, else_=0.0)
+    score = db.func.sum(SearchPosting.weight * idf).label('score')
+
+    query = (db.session.query(SearchPosting.kind, SearchPosting.entry_id, score)
+             .filter(SearchPosting.term.in_(wanted)))
+    if kind:
+        query = query.filter(SearchPosting.kind == kind)
+    query = query.group_by(SearchPosting.kind, SearchPosting.entry_id)
+    if exact:
+        # Every exact term and at least one expansion of the prefix must match
+        slot = db.case({term: i for i, term in enumerate(exact)}, value=SearchPosting.term, else_=len(exact))
+        query = query.having(db.func.count(db.distinct(slot)) == len(exact) + 1)
+    hits = query.order_by(score.desc(), SearchPosting.entry_id).limit(limit).offset(offset).all()
+
+    entries = {}
+    for hit_kind in {hit.kind for hit in hits}:
+        model = SEARCH_KINDS[hit_kind]
+        ids = [hit.entry_id for hit in hits if hit.kind == hit_kind]
+        for entry in model.query.options(load_only(*[getattr(model, name) for name in model.search_fields])) \
+                                .filter(model.id.in_(ids)):
+            entries[hit_kind, entry.id] = entry
+
+    matches = lambda term: term in wanted or term.startswith(prefix)
+    results = []
+    for hit in hits:
+        entry = entries.get((hit.kind, hit.entry_id))
+        if entry is None:
+            continue
+        fields = [getattr(entry, name) for name in entry.search_fields]
+        results.append({'type': hit.kind, 'id': hit.entry_id, 'title': entry.title,
+                        'snippet': make_snippet(fields, matches), 'score': round(hit.score, 4)})
+    return results
+
+def search_entries(q, kind, limit, offset):
+    """Ranked matches for q; the last word also matches as a prefix"""
+    terms = list(dict.fromkeys(term for term in search_terms(q) if term))[:SEARCH_MAX_TERMS]
+    if not terms:
+        return []
+    with timed('search'):
+        if search_backend() == 'fts5':
+            return search_fts5(terms, kind, limit, offset)
+        return search_postings(terms, kind, limit, offset)
+
+# Change feed
+# Every write to a Project or BlogPost (including bulk imports and deletes)
+# moves that entry to the end of the change_log with a new sequence number,
+# in the same transaction. Clients keep the last sequence number they saw
+# and ask /api/changes for everything after it, so a sync costs as much as
+# what changed since then. Deleted entries stay in the log as tombstones.
+# This relies on sequence numbers becoming visible in order. SQLite runs one
+# writer at a time, so that holds there. On PostgreSQL, a transaction that
+# took a lower number could otherwise commit after a reader had already moved
+# past it, so writers lock the change_log table until they commit. Other
+# databases are not supported by the feed.
+CHANGE_KINDS = {'project': Project, 'blog': BlogPost}
+
+def change_kind(model):
+    return next(kind for kind, kind_model in CHANGE_KINDS.items() if kind_model is model)
+
+def record_changes(connection, kind, ids, deleted=False):
+    ids = list(ids)
+    if not ids:
+        return
+    if connection.dialect.name == 'postgresql':
+        # Held until commit, so sequence numbers are committed in order. Readers are not blocked.
+        connection.execute(db.text('LOCK TABLE change_log IN EXCLUSIVE MODE'))
+    now = datetime.utcnow()
+    connection.execute(db.delete(ChangeLog).where(ChangeLog.kind == kind, ChangeLog.entry_id.in_(ids)))
+    connection.execute(db.insert(ChangeLog), [{'kind': kind, 'entry_id': entry_id, 'deleted': deleted,
+                                               'changed_at': now} for entry_id in ids])
+
+@event.listens_for(db.session, 'after_flush')
+def track_entry_changes(session, flush_context):
+    changed, removed = {}, {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ProjectTag):
+            # Re-tagging a project changes its "tech" list
+            changed.setdefault('project', set()).add(obj.project_id)
+        elif type(obj) in CHANGE_KINDS.values():
+            kind = change_kind(type(obj))
+            if obj in session.deleted:
+                removed.setdefault(kind, set()).add(obj.id)
+            elif obj in session.new or session.is_modified(obj, include_collections=False):
+                changed.setdefault(kind, set()).add(obj.id)
+    if not changed and not removed:
+        return
+    connection = session.connection()
+    for kind, ids in changed.items():
+        record_changes(connection, kind, ids - removed.get(kind, set()))
+    for kind, ids in removed.items():
+        record_changes(connection, kind, ids, deleted=True)
+
+def init_change_log():
+    """Backfill updated_at and seed the log with existing entries, oldest first"""
+    for model in CHANGE_KINDS.values():
+        db.session.execute(db.update(model).where(model.updated_at.is_(None))
+                           .values(updated_at=model.created_at))
+    if ChangeLog.query.first() is None:
+        for kind, model in CHANGE_KINDS.items():
+            db.session.execute(db.insert(ChangeLog).from_select(
+                ['kind', 'entry_id', 'deleted', 'changed_at'],
+                db.select(db.literal(kind), model.id, db.false(), db.func.coalesce(model.updated_at, model.created_at))
+                .order_by(model.created_at, model.id)))
+    db.session.commit()
+
+def parse_change_cursor(value):
+    if not value:
+        return 0
+    if not value.isdigit():
+        raise ValueError('Invalid cursor')
+    return int(value)
+
+def get_changes(since, limit):
+    """Changes after sequence number since; returns (changes, cursor, has_more)"""
+    rows = ChangeLog.query.filter(ChangeLog.id > since).order_by(ChangeLog.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    entries = {}
+    for kind, model in CHANGE_KINDS.items():
+        ids = [row.entry_id for row in rows if row.kind == kind and not row.deleted]
+        if ids:
+            for entry in model.query.options(*entry_load_options(model)).filter(model.id.in_(ids)):
+                entries[kind, entry.id] = entry
+
+    changes = []
+    for row in rows:
+        entry = entries.get((row.kind, row.entry_id))
+        change = {'seq': row.id, 'type': row.kind, 'id': row.entry_id,
+                  'op': 'upsert' if entry is not None else 'delete',
+                  'changedAt': row.changed_at.isoformat()}
+        if entry is not None:
+            change['updatedAt'] = entry.updated_at.isoformat() if entry.updated_at else None
+            change['data'] = entry.to_dict()
+        changes.append(change)
+    return changes, str(rows[-1].id if rows else since), has_more
+
+# Live updates
+# /api/stream pushes one small Server-Sent Event per change_log row. A single
+# hub thread per process watches the content version stamp (one small read per
+# poll), reads the new change_log rows once and appends the encoded events to
+# a ring buffer; subscribers only wait on a condition and copy from the
+# buffer, so idle connections cost no queries. Under a gevent worker the
+# waits are cooperative and an idle connection holds a greenlet, not a thread.
+# Anywhere else each subscriber pins a worker thread. Threaded servers get
+# only STREAM_THREADED_MAX_CLIENTS subscribers, and each connection is closed
+# after STREAM_THREADED_MAX_DURATION seconds; EventSource reconnects and
+# resumes from Last-Event-ID. Single-threaded workers (gunicorn's default
+# sync worker) refuse streams, because one subscriber would take the whole
+# worker.
+STREAM_BUFFER_SIZE = 1024
+
+def async_worker():
+    """True under gevent or eventlet, where an idle connection does not hold a thread"""
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    if gevent_monkey is not None and gevent_monkey.is_module_patched('socket'):
+        return True
+    eventlet_patcher = sys.modules.get('eventlet.patcher')
+    return eventlet_patcher is not None and eventlet_patcher.is_monkey_patched('socket')
+
+class StreamHub:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.events = collections.deque(maxlen=STREAM_BUFFER_SIZE)  # (seq, encoded event)
+        self.last_seq = None  # Newest sequence number published
+        self.floor = None  # Events after this one are all still in the buffer
+        self.clients = 0
+        self._version = None
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            with app.app_context():
+                self.last_seq = self.floor = db.session.query(db.func.max(ChangeLog.id)).scalar() or 0
+                db.session.remove()
+            self._version = get_content_version()
+            self._thread = threading.Thread(target=self.run, name='stream-hub', daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def run(self):
+        while True:
+            self._wakeup.wait(app.config['STREAM_POLL_INTERVAL'])
+            self._wakeup.clear()
+            version = get_content_version()
+            if version == self._version:
+                continue
+            self._version = version
+            try:
+                with app.app_context():
+                    while True:
+                        rows = (ChangeLog.query.filter(ChangeLog.id > self.last_seq)
+                                .order_by(ChangeLog.id).limit(STREAM_BUFFER_SIZE).all())
+                        if rows:
+                            self.publish(rows)
+                        if len(rows) < STREAM_BUFFER_SIZE:
+                            break
+                    db.session.remove()
+            except Exception as e:
+                print(f"Stream hub error: {e}")
+                self._version = None  # Retry on the next poll
+
+    def publish(self, rows):
+        with self.condition:
+            for row in rows:
+                if len(self.events) == self.events.maxlen:
+                    self.floor = self.events[0][0]
+                data = json.dumps({'type': row.kind, 'id': row.entry_id,
+                                   'op': 'delete' if row.deleted else 'upsert'}, separators=(',', ':'))
+                self.events.append((row.id, f'id: {row.id}\nevent: change\ndata: {data}\n\n'.encode('utf-8')))
+                self.last_seq = row.id
+            self.condition.notify_all()
+
+    def connect(self, max_clients):
+        """Count a new client; False when the worker is full"""
+        with self.condition:
+            if self.clients >= max_clients:
+                return False
+            self.clients += 1
+            return True
+
+    def disconnect(self):
+        with self.condition:
+            self.clients -= 1
+
+    def subscribe(self, last_id, max_duration=None):
+        """Event stream for one client, resuming after last_id when it is given
+
+        With max_duration the stream ends after that many seconds and the
+        client reconnects with Last-Event-ID.
+        """
+        heartbeat = app.config['STREAM_HEARTBEAT']
+        deadline = time.monotonic() + max_duration if max_duration else None
+        yield b'retry: 5000\n\n'
+        with self.condition:
+            position = self.last_seq if last_id is None else last_id
+        while True:
+            timeout = heartbeat
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    return
+                timeout = min(timeout, heartbeat)
+            with self.condition:
+                if position < self.floor:
+                    # Older than the buffer: the client catches up through /api/changes
+                    chunk = f'event: resync\ndata: {{"since":"{position}"}}\n\n'.encode('utf-8')
+                    position = self.floor
+                elif self.condition.wait_for(lambda: self.last_seq > position, timeout=timeout):
+                    chunk = b''.join(event for seq, event in self.events if seq > position)
+                    position = self.last_seq
+                else:
+                    chunk = b': keep-alive\n\n'
+            yield chunk
+
+stream_hub = StreamHub()
+
+def ensure_columns():
+    """Add nullable columns declared on the models to tables created before they existed"""
+    inspector = sa_inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                print(f"Column error ({table.name}.{column.name}): cannot add a NOT NULL column")
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+
+# The UNIQUE constraints on user.username and user.email already come with
+# an index; these duplicates only slowed down every insert and update
+REDUNDANT_INDEXES = {'user': ['ix_user_username', 'ix_user_email']}
+
+def ensure_indexes():
+    """Add indexes declared on the models to tables created before they existed"""
+    inspector = db.inspect(db.engine)
+    for table_name, names in REDUNDANT_INDEXES.items():
+        existing = {index['name'] for index in inspector.get_indexes(table_name)}
+        for name in names:
+            if name in existing:
+                try:
+                    with db.engine.begin() as conn:
+                        conn.exec_driver_sql(f'DROP INDEX {name}')
+                except Exception as e:
+                    print(f"Index error ({name}): {e}")
+
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=db.engine, checkfirst=True)
+            except Exception as e:
+                print(f"Index error ({index.name}): {e}")
+
+# Bulk import
+# Rows are upserted in chunks: one IN (...) query per model finds the rows
+# that already exist, then new and changed rows are written with one
+# executemany INSERT/UPDATE per table and the chunk is committed together.
+# If the commit fails, the chunk is replayed row by row so only the
+# offending rows are reported.
+BULK_CHUNK_SIZE = 500
+BULK_MODELS = {'project': Project, 'blog': BlogPost}
+# Ids end up in file names (export-static writes projects/<id>.html)
+ENTRY_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,36}')
+
+def validate_entry_id(entry_id):
+    if entry_id in (None, ''):
+        return
+    if not isinstance(entry_id, str) or not ENTRY_ID_PATTERN.fullmatch(entry_id):
+        raise ValueError("'id' must be up to 36 letters, digits, '-' or '_'")
+
+def validate_entry_data(model, data, is_new):
+    validate_entry_id(data.get('id'))
+    if is_new:
+        missing = [key for key in model.api_fields if key != 'id' and key not in data]
+        if missing:
+            raise ValueError(f"Missing field(s): {', '.join(missing)}")
+    for key in model.api_fields:
+        value = data.get(key)
+        if value is None and key == 'id':
+            continue
+        if key == 'tech' and isinstance(value, list):
+            if not all(isinstance(name, str) for name in value):
+                raise ValueError("'tech' must be a string or a list of strings")
+        elif key in data and not isinstance(value, str):
+            raise ValueError(f"'{key}' must be a string")
+    if 'createdAt' in data:
+        datetime.fromisoformat(data['createdAt'])
+
+def entry_columns(model, data):
+    """Column values for a validated API row, keyed by column name"""
+    values = {column: data[key] for key, column in model.api_fields.items()
+              if key in data and key != 'tech' and column in model.__table__.columns}
+    if 'tech' in data:
+        values['tech'] = ','.join(Project.tech_names(data['tech']))
+    if 'createdAt' in data:
+        values['created_at'] = datetime.fromisoformat(data['createdAt'])
+    return values
+
+def import_chunk(rows, insert_only=False):
+    """Upsert a list of (line, model, data); returns one result dict per row"""
+    existing = set()
+    for model in BULK_MODELS.values():
+        ids = [data['id'] for line, row_model, data in rows if row_model is model and data.get('id')]
+        if ids:
+            existing.update((model, entry_id) for entry_id, in
+                            db.session.query(model.id).filter(model.id.in_(ids)))
+
+    results = {}
+    inserts = {model: [] for model in BULK_MODELS.values()}
+    updates = {model: [] for model in BULK_MODELS.values()}
+    project_tags = {}  # project id -> tag names, for rows that set tech
+    for line, model, data in rows:
+        key = (model, data.get('id'))
+        try:
+            validate_entry_data(model, data, is_new=key not in existing)
+        except (ValueError, TypeError) as e:
+            results[line] = {'line': line, 'id': data.get('id'), 'status': 'error', 'error': str(e)}
+            continue
+
+        values = entry_columns(model, data)
+        if key in existing:
+            if insert_only:
+                results[line] = {'line': line, 'id': data['id'], 'status': 'skipped'}
+                continue
+            updates[model].append(values)
+            status = 'updated'
+        else:
+            values['id'] = data.get('id') or str(uuid.uuid4())
+            values.setdefault('created_at', datetime.utcnow())
+            inserts[model].append(values)
+            existing.add((model, values['id']))
+            status = 'created'
+        if model is Project and 'tech' in data:
+            project_tags[values['id']] = Project.tech_names(data['tech'])
+        results[line] = {'line': line, 'id': values['id'], 'status': status}
+
+    try:
+        for model in BULK_MODELS.values():
+            if inserts[model]:
+                db.session.execute(db.insert(model), inserts[model])
+            if updates[model]:
+                db.session.execute(db.update(model), updates[model])
+        if project_tags:
+            tags = Tag.get_or_create(list(dict.fromkeys(name for names in project_tags.values() for name in names)))
+            db.session.flush()
+            db.session.execute(db.delete(ProjectTag).where(ProjectTag.project_id.in_(list(project_tags))))
+            links = [{'project_id': project_id, 'tag_id': tags[name].id, 'position': position}
+                     for project_id, names in project_tags.items() for position, name in enumerate(names)]
+            if links:
+                db.session.execute(db.insert(ProjectTag), links)
+        # Bulk statements bypass the unit of work, so flag the content change
+        # and refresh the search index explicitly
+        for model in BULK_MODELS.values():
+            written = [values['id'] for values in inserts[model] + updates[model]]
+            if written:
+                reindex_entries(db.session.connection(), model, set(written))
+                record_changes(db.session.connection(), change_kind(model), set(written))
+                db.session.info['content_changed'] = True
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        if len(rows) == 1:
+            return [{'line': rows[0][0], 'id': rows[0][2].get('id'), 'status': 'error', 'error': str(e)}]
+        return [result for row in rows for result in import_chunk([row], insert_only)]
+    return [results[line] for line, model, data in rows]
+
+def import_entries(rows, insert_only=False, chunk_size=BULK_CHUNK_SIZE):
+    """Import an iterable of (line, type, data); yields one result dict per row"""
+    chunk = []
+    for line, entry_type, data in rows:
+        model = BULK_MODELS.get(entry_type)
+        if not isinstance(data, dict):
+            yield {'line': line, 'id': None, 'status': 'error', 'error': 'Not a JSON object'}
+            continue
+        if model is None:
+            yield {'line': line, 'id': data.get('id'), 'status': 'error', 'error': f"Unknown type: {entry_type!r}"}
+            continue
+        # Checked before the chunk's id lookup, which cannot bind non-string ids
+        try:
+            validate_entry_id(data.get('id'))
+        except ValueError as e:
+            yield {'line': line, 'id': None, 'status': 'error', 'error': str(e)}
+            continue
+        chunk.append((line, model, data))
+        if len(chunk) >= chunk_size:
+            yield from import_chunk(chunk, insert_only)
+            chunk = []
+    if chunk:
+        yield from import_chunk(chunk, insert_only)
+
+def iter_lines(stream, chunk_size=1 << 16):
+    # Iterating the request stream directly reads it in tiny pieces, which is
+    # very slow for large bodies, so split lines out of large reads instead
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
 
 DATA_FILE = 'data.json'
 
-def migrate_json_to_db():
+def migrate_json_to_db(path=DATA_FILE):
     """Migrate existing data.json to database if it exists"""
-    if not os.path.exists(DATA_FILE):
+    if not os.path.exists(path):
         return
     
     try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        # Migrate projects
-        for project_data in data.get('projects', []):
-            # Check if project already exists
-            if not Project.query.get(project_data.get('id')):
-                project = Project(
-                    id=project_data.get('id', str(uuid.uuid4())),
-                    title=project_data['title'],
-                    description=project_data['description'],
-                    tech=','.join(project_data['tech']) if isinstance(project_data['tech'], list) else project_data['tech'],
-                    image=project_data['image'],
-                    cover=project_data['cover'],
-                    source=project_data['source'],
-                    details=project_data['details']
-                )
-                db.session.add(project)
-        
-        # Migrate blog posts
-        for post_data in data.get('blogPosts', []):
-            # Check if post already exists
-            if not BlogPost.query.get(post_data.get('id')):
-                post = BlogPost(
-                    id=post_data.get('id', str(uuid.uuid4())),
-                    title=post_data['title'],
-                    excerpt=post_data['excerpt'],
-                    date=post_data['date'],
-                    category=post_data['category'],
-                    image=post_data['image'],
-                    cover=post_data['cover'],
-                    read_time=post_data['readTime'],
-                    content=post_data['content']
-                )
-                db.session.add(post)
-        
-        db.session.commit()
+        rows = [('project', project_data) for project_data in data.get('projects', [])]
+        rows += [('blog', post_data) for post_data in data.get('blogPosts', [])]
+        rows = [(line, entry_type, entry_data) for line, (entry_type, entry_data) in enumerate(rows, 1)]
+        errors = [result for result in import_entries(rows, insert_only=True) if result['status'] == 'error']
+        for error in errors:
+            print(f"Migration error ({error['id']}): {error['error']}")
         print("Data migration completed successfully!")
     except Exception as e:
         print(f"Migration error: {e}")
         db.session.rollback()
 
-# Run migration on startup
-with app.app_context():
+def migrate_tech_tags():
+    """Populate tag rows for projects created before tags were normalized"""
+    try:
+        projects = Project.query.filter(~Project.tag_links.any()).all()
+        for project in projects:
+            project.set_tech(project.tech or '')
+        if projects:
+            db.session.commit()
+            print(f"Migrated tags for {len(projects)} project(s).")
+    except Exception as e:
+        print(f"Tag migration error: {e}")
+        db.session.rollback()
+
+# Database setup
+# Tables, indexes and the data.json import are set up on the first request
+# rather than at import time, and a marker in the instance folder records
+# the schema they were set up for so later boots skip the work entirely.
+# `flask init-db` and `flask migrate-json` run the same steps by hand.
+DB_INIT_MARKER = os.path.join(app.instance_path, 'db.initialized')
+
+_db_ready = False
+_db_ready_lock = threading.Lock()
+
+def schema_signature():
+    """Changes whenever the database URI or a declared table/index changes"""
+    parts = [app.config['SQLALCHEMY_DATABASE_URI']]
+    for table in db.metadata.sorted_tables:
+        parts.append(f"{table.name}({','.join(column.name for column in table.columns)})"
+                     f"[{','.join(sorted(index.name for index in table.indexes))}]")
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+def database_file_missing():
+    # A marker is meaningless if the SQLite file it describes has gone away
+    url = db.engine.url
+    if url.get_backend_name() != 'sqlite':
+        return False
+    return not url.database or url.database == ':memory:' or not os.path.exists(url.database)
+
+def init_db():
+    db.create_all()
+    ensure_columns()
+    ensure_indexes()
+    init_search_index()
+    init_change_log()
+
+def setup_database(force=False):
+    """Create tables and import data.json unless the marker says it is done"""
+    signature = schema_signature()
+    if not force and not database_file_missing():
+        try:
+            with open(DB_INIT_MARKER, 'r', encoding='utf-8') as f:
+                if f.read().strip() == signature:
+                    return False
+        except OSError:
+            pass
+    init_db()
     migrate_json_to_db()
+    migrate_tech_tags()
+    with open(DB_INIT_MARKER, 'w', encoding='utf-8') as f:
+        f.write(signature)
+    return True
+
+def ensure_database():
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_ready_lock:
+        if _db_ready:
+            return
+        setup_database()
+        # Deliver anything left in the spool by a previous run
+        start_mail_workers()
+        _db_ready = True
+
+@app.before_request
+def prepare_database():
+    ensure_database()
+
+# Outbound mail queue
+# Messages are written to the mail_outbox table and delivered by a small pool
+# of background threads that share one SMTP connection each, so requests only
+# pay for an INSERT. A row being sent holds a lease (next_attempt_at in the
+# future); if the process dies mid-send the lease expires and it is retried.
+MAIL_SEND_LEASE = timedelta(minutes=5)
+
+_mail_wakeup = threading.Event()
+_mail_workers = []
+_mail_workers_lock = threading.Lock()
+
+def queue_mail(msg):
+    entry = MailOutbox(subject=msg.subject,
+                       sender=msg.sender,
+                       recipients=json.dumps(list(msg.recipients)),
+                       body=msg.body)
+    db.session.add(entry)
+    db.session.commit()
+    start_mail_workers()
+    _mail_wakeup.set()
+    return entry.id
+
+def claim_mail():
+    while True:
+        now = datetime.utcnow()
+        entry = MailOutbox.query.filter(
+            MailOutbox.status.in_(['pending', 'sending']),
+            MailOutbox.next_attempt_at <= now
+        ).order_by(MailOutbox.next_attempt_at).first()
+        if entry is None:
+            return None
+
+        claimed = MailOutbox.query.filter_by(
+            id=entry.id, status=entry.status, next_attempt_at=entry.next_attempt_at
+        ).update({'status': 'sending', 'next_attempt_at': now + MAIL_SEND_LEASE},
+                 synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return db.session.get(MailOutbox, entry.id)
+
+def complete_mail(entry):
+    db.session.delete(entry)
+    db.session.commit()
+
+def fail_mail(entry, error):
+    entry.attempts += 1
+    entry.last_error = str(error)
+    if entry.attempts >= app.config['MAIL_MAX_ATTEMPTS']:
+        entry.status = 'failed'
+    else:
+        backoff = app.config['MAIL_RETRY_BACKOFF'] * 2 ** (entry.attempts - 1)
+        entry.status = 'pending'
+        entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff)
+    db.session.commit()
+    print(f"Mail error (attempt {entry.attempts}, id {entry.id}): {error}")
+
+def open_mail_connection():
+    return mail.connect().__enter__()
+
+def close_mail_connection(connection):
+    try:
+        connection.__exit__(None, None, None)
+    except Exception:
+        pass
+
+def mail_worker():
+    connection = None
+    last_used = 0
+    with app.app_context():
+        while True:
+            try:
+                entry = claim_mail()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Mail queue error: {e}")
+                entry = None
+
+            if entry is None:
+                db.session.remove()
+                if connection and time.monotonic() - last_used > app.config['MAIL_CONNECTION_IDLE']:
+                    close_mail_connection(connection)
+                    connection = None
+                _mail_wakeup.wait(timeout=5)
+                _mail_wakeup.clear()
+                continue
+
+            entry_id = entry.id
+            start = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = open_mail_connection()
+                connection.send(entry.to_message())
+            except Exception as e:
+                observe('mail_send_duration_seconds', time.perf_counter() - start, result='failed')
+                if connection:
+                    close_mail_connection(connection)
+                    connection = None
+                error = e
+            else:
+                observe('mail_send_duration_seconds', time.perf_counter() - start, result='sent')
+                last_used = time.monotonic()
+                error = None
+
+            # A failed update (e.g. database is locked) leaves the lease in
+            # place, so the message is picked up again once it expires
+            try:
+                if error is None:
+                    complete_mail(entry)
+                else:
+                    fail_mail(entry, error)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Mail queue error (id {entry_id}): {e}")
+            finally:
+                db.session.remove()
+
+def start_mail_workers():
+    if len(_mail_workers) == app.config['MAIL_QUEUE_WORKERS'] and all(w.is_alive() for w in _mail_workers):
+        return
+    with _mail_workers_lock:
+        # Replace any worker that died so the queue keeps draining
+        _mail_workers[:] = [worker for worker in _mail_workers if worker.is_alive()]
+        for i in range(len(_mail_workers), app.config['MAIL_QUEUE_WORKERS']):
+            worker = threading.Thread(target=mail_worker, name=f'mail-worker-{i}', daemon=True)
+            worker.start()
+            _mail_workers.append(worker)
+
+# Keyset pagination for content listings
+# Entries are ordered newest first by (created_at, id); the cursor is the
+# position of the last entry returned, so each page is a single index range
+# scan no matter how deep the client has paged.
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+PUBLISH_PAGE_SIZE = 50
+
+def encode_cursor(entry):
+    raw = f'{entry.created_at.isoformat()}|{entry.id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, entry_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), entry_id
+    except ValueError:
+        raise ValueError('Invalid cursor')
+
+def parse_fields(model, fields_arg):
+    if not fields_arg:
+        return None
+    fields = [f.strip() for f in fields_arg.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in model.api_fields]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+def entry_load_options(model, fields=None):
+    """Loader options that fetch exactly what to_dict(fields) will read"""
+    relationships = sa_inspect(model).relationships
+    columns, options = {'id', 'created_at'}, []
+    for key in (model.api_fields if fields is None else fields):
+        attr = model.api_fields[key]
+        if attr in relationships:
+            options.append(selectinload(getattr(model, attr)))
+        else:
+            columns.add(attr)
+    if fields is not None:
+        options.append(load_only(*[getattr(model, c) for c in columns]))
+    return options
+
+def keyset_filter(model, created_at, entry_id):
+    # The leading range on created_at lets the database seek straight into
+    # the (created_at, id) index instead of scanning from the newest entry
+    return db.and_(
+        model.created_at <= created_at,
+        db.or_(model.created_at < created_at, model.id < entry_id)
+    )
+
+def paginate_entries(query, model, cursor=None, limit=DEFAULT_PAGE_SIZE, fields=None):
+    if fields is not None:
+        query = query.options(*entry_load_options(model, fields))
+
+    if cursor:
+        query = query.filter(keyset_filter(model, *decode_cursor(cursor)))
+
+    entries = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1])
+    return entries, next_cursor
+
+def list_entries_response(model, query):
+    try:
+        limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+        fields = parse_fields(model, request.args.get('fields'))
+        entries, next_cursor = paginate_entries(query, model,
+                                                cursor=request.args.get('cursor'),
+                                                limit=limit,
+                                                fields=fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'items': [entry.to_dict(fields) for entry in entries],
+        'next_cursor': next_cursor
+    })
+
+# Current user
+# The logged-in user is loaded at most once per request and kept on g. With
+# USER_CACHE_TTL > 0 the row's columns are also cached per process for that
+# many seconds and re-attached to the session without a SELECT; commits that
+# touch a User row drop its cache entry.
+_user_cache = {}  # user id -> (expires_at, column values)
+_user_cache_lock = threading.Lock()
+USER_CACHE_MAX_ENTRIES = 1024
+
+def load_user(user_id):
+    ttl = app.config['USER_CACHE_TTL']
+    if ttl > 0:
+        cached = _user_cache.get(user_id)
+        if cached and cached[0] > time.monotonic():
+            user = User(**cached[1])
+            make_transient_to_detached(user)
+            return db.session.merge(user, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None and ttl > 0:
+        values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        with _user_cache_lock:
+            if len(_user_cache) >= USER_CACHE_MAX_ENTRIES:
+                _user_cache.clear()
+            _user_cache[user_id] = (time.monotonic() + ttl, values)
+    return user
+
+def get_current_user():
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        g.current_user = load_user(user_id) if user_id is not None else None
+    return g.current_user
+
+@event.listens_for(db.session, 'after_flush')
+def track_user_changes(session, flush_context):
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault('changed_users', set()).add(obj.id)
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_user_cache(session):
+    for user_id in session.info.pop('changed_users', ()):
+        _user_cache.pop(user_id, None)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_user_changes(session):
+    session.info.pop('changed_users', None)
+
+def revoke_sessions(user_id):
+    """Log a user out everywhere; returns the number of sessions ended"""
+    return app.session_interface.revoke_user(user_id)
+
+# 2FA QR codes
+# The otpauth:// URI only changes with the secret, so the rendered QR code is
+# cached per (user, secret, format) and served from its own URL, which carries
+# a digest of the secret so browsers can cache it until the secret changes.
+# SVG is written straight from the module matrix instead of being drawn on a
+# PIL image and encoded. Importing qrcode (any of its modules) still loads
+# PIL when it is installed, so the import is deferred to the first render.
+QR_CACHE_MAX_ENTRIES = 256
+QR_FORMATS = {'svg': 'image/svg+xml', 'png': 'image/png'}
+_qr_cache = {}  # (user id, secret, format) -> (body, etag)
+_qr_cache_lock = threading.Lock()
+
+def render_qr_svg(matrix, scale=10):
+    size = len(matrix)
+    path = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < size and row[x]:
+                x += 1
+            path.append(f'M{start} {y}h{x - start}v1h{start - x}z')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size * scale}" height="{size * scale}" '
+            f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+            f'<rect width="{size}" height="{size}" fill="#fff"/>'
+            f'<path d="{"".join(path)}" fill="#000"/></svg>')
+
+def get_qr_code(user, fmt):
+    key = (user.id, user.two_fa_secret, fmt)
+    cached = _qr_cache.get(key)
+    if cached:
+        return cached
+
+    with timed('qr_code'):
+        import qrcode
+        qr = qrcode.QRCode(border=4)
+        qr.add_data(user.get_totp_uri())
+        qr.make(fit=True)
+        if fmt == 'svg':
+            body = render_qr_svg(qr.get_matrix()).encode('utf-8')
+        else:
+            buf = io.BytesIO()
+            qr.make_image().save(buf, format='PNG')
+            body = buf.getvalue()
+    cached = (body, hashlib.sha256(body).hexdigest()[:32])
+    with _qr_cache_lock:
+        if len(_qr_cache) >= QR_CACHE_MAX_ENTRIES:
+            _qr_cache.clear()
+        _qr_cache[key] = cached
+    return cached
+
+def discard_qr_codes(user_id):
+    with _qr_cache_lock:
+        for key in [key for key in _qr_cache if key[0] == user_id]:
+            del _qr_cache[key]
+
+def qr_code_version(user):
+    return hashlib.sha256(f'{user.id}:{user.two_fa_secret}'.encode('utf-8')).hexdigest()[:16]
 
 # Login required decorator
 def login_required(f):
@@ -222,17 +1944,107 @@ def login_required(f):
 def email_verified_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user = User.query.get(session.get('user_id'))
+        user = get_current_user()
         if user and not user.email_verified:
             flash('Please verify your email address to access this page.', 'warning')
             return redirect(url_for('unverified'))
         return f(*args, **kwargs)
     return decorated_function
 
+# Template caches
+# Compiled templates are kept on disk so a new worker loads bytecode instead
+# of recompiling. Anonymous GETs of the public pages only vary by language,
+# so their HTML is cached per process, keyed by path and language and
+# revalidated against the content and translation versions. The cached HTML
+# holds a placeholder instead of the session's CSRF token, filled in per
+# response. Anything carrying flash messages bypasses the cache. Publish page
+# cards are cached per entry until its updated_at or its image URL changes.
+os.makedirs(os.path.join(app.instance_path, 'jinja_cache'), exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.path.join(app.instance_path, 'jinja_cache'))
+
+CSRF_PLACEHOLDER = '\x00csrf-token\x00'
+_page_cache = {}  # (path, language) -> (versions, body)
+_fragment_cache = {}  # (kind, id, updated_at, image URL) -> Markup
+CARD_TEMPLATES = {'project': 'partials/project_card.html', 'post': 'partials/post_card.html'}
+CARD_IMAGE_VARIANT = 'thumb'
+
+def csrf_token():
+    return CSRF_PLACEHOLDER if g.get('rendering_cached_page') else generate_csrf()
+
+app.jinja_env.globals['csrf_token'] = csrf_token
+
+@app.context_processor
+def csrf_token_processor():
+    # Flask-WTF also injects csrf_token through a context processor, which
+    # takes precedence over globals; this one runs after it
+    return {'csrf_token': csrf_token}
+
+def page_versions(language):
+    get_translations(language)  # Reloads the catalogue if its file changed
+    return get_content_version(), _translations.get(language, (None,))[0]
+
+def cached_page(f):
+    """Serve anonymous GETs of a public page from the per-process page cache"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # Query strings are not part of the key, so pages asked for with one
+        # (e.g. ?next=) bypass the cache rather than letting arbitrary URLs fill it
+        if (request.method != 'GET' or not app.config['PAGE_CACHE_MAX_ENTRIES'] or request.query_string
+                or 'user_id' in session or '2fa_user_id' in session or '_flashes' in session):
+            return f(*args, **kwargs)
+
+        language = get_locale()
+        key = (request.path, language)
+        versions = page_versions(language)
+        cached = _page_cache.get(key)
+        if cached is not None and cached[0] == versions:
+            body = cached[1]
+            increment('page_cache_total', result='hit')
+        else:
+            g.rendering_cached_page = True
+            try:
+                response = app.make_response(f(*args, **kwargs))
+            finally:
+                g.rendering_cached_page = False
+            if response.status_code != 200 or response.mimetype != 'text/html' or '_flashes' in session:
+                # Not cached, but it was still rendered with the placeholder
+                if not response.is_streamed:
+                    data = response.get_data()
+                    if CSRF_PLACEHOLDER.encode('utf-8') in data:
+                        response.set_data(data.replace(CSRF_PLACEHOLDER.encode('utf-8'),
+                                                       generate_csrf().encode('utf-8')))
+                return response
+            body = response.get_data(as_text=True)
+            if len(_page_cache) >= app.config['PAGE_CACHE_MAX_ENTRIES']:
+                _page_cache.clear()
+            _page_cache[key] = (versions, body)
+            increment('page_cache_total', result='miss')
+        if CSRF_PLACEHOLDER in body:
+            body = body.replace(CSRF_PLACEHOLDER, generate_csrf())
+        return app.response_class(body, mimetype='text/html')
+    return decorated_function
+
+def render_card(kind, entry):
+    """Publish page card for an entry, rendered once per version of the entry and its image"""
+    # The image URL carries the digest of the fetched source, which changes
+    # when the remote image does even though the entry does not
+    image = image_url(entry, CARD_IMAGE_VARIANT)
+    key = (kind, entry.id, entry.updated_at, image)
+    html = _fragment_cache.get(key)
+    if html is None:
+        html = Markup(app.jinja_env.get_template(CARD_TEMPLATES[kind]).render(entry=entry, image=image))
+        if app.config['FRAGMENT_CACHE_MAX_ENTRIES']:
+            if len(_fragment_cache) >= app.config['FRAGMENT_CACHE_MAX_ENTRIES']:
+                _fragment_cache.clear()
+            _fragment_cache[key] = html
+    return html
+
+app.jinja_env.globals['render_card'] = render_card
+
 # Add context processor to make get_text available in all templates
 @app.context_processor
 def utility_processor():
-    return dict(get_text=get_text, current_language=get_locale())
+    return dict(get_text=get_translator(), current_language=get_locale())
 
 # Add language switching route
 @app.route('/set-language/<lang>')
@@ -243,10 +2055,12 @@ def set_language(lang):
 
 # Routes
 @app.route('/')
+@cached_page
 def index():
     return render_template('index.html')
 
 @app.route('/register', methods=['GET', 'POST'])
+@cached_page
 def register():
     if 'user_id' in session:
         return redirect(url_for('dashboard'))
@@ -309,7 +2123,7 @@ If you did not create an account, please ignore this email.
 Best regards,
 Flask Auth App Team
 '''
-            mail.send(msg)
+            queue_mail(msg)
             flash('Registration successful! Please check your email to verify your account.', 'success')
         except Exception as e:
             flash('Registration successful! However, we could not send the verification email. Please contact support.', 'warning')
@@ -347,12 +2161,13 @@ def verify_email(token):
 @app.route('/unverified')
 @login_required
 def unverified():
-    user = User.query.get(session['user_id'])
+    user = get_current_user()
     if user and user.email_verified:
         return redirect(url_for('dashboard'))
     return render_template('unverified.html')
 
 @app.route('/resend-verification', methods=['GET', 'POST'])
+@cached_page
 def resend_verification():
     if request.method == 'POST':
         email = request.form.get('email', '').strip().lower()
@@ -382,7 +2197,7 @@ If you did not create an account, please ignore this email.
 Best regards,
 Flask Auth App Team
 '''
-                mail.send(msg)
+                queue_mail(msg)
                 flash('Verification email has been sent. Please check your inbox.', 'success')
             except Exception as e:
                 flash('Error sending email. Please try again later.', 'error')
@@ -396,6 +2211,7 @@ Flask Auth App Team
 
 @app.route('/login', methods=['GET', 'POST'])
 @limiter.limit("5 per minute")
+@cached_page
 def login():
     if 'user_id' in session:
         return redirect(url_for('dashboard'))
@@ -408,6 +2224,11 @@ def login():
         user = User.query.filter_by(email=email).first()
         
         if user and user.check_password(password):
+            # Upgrade the stored hash when the configured work factor changed
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
+
             if not user.email_verified:
                 flash('Please verify your email address before logging in. Check your inbox for the verification link.', 'warning')
                 return render_template('login.html')
@@ -417,6 +2238,7 @@ def login():
                 session['2fa_user_id'] = user.id
                 return redirect(url_for('verify_2fa'))
             
+            session.regenerate()
             session['user_id'] = user.id
             session['username'] = user.username
             session.permanent = remember
@@ -438,6 +2260,7 @@ def verify_2fa():
         user = User.query.get(session['2fa_user_id'])
         
         if user and user.verify_totp(token):
+            session.regenerate()
             session['user_id'] = user.id
             session['username'] = user.username
             session.pop('2fa_user_id', None)
@@ -453,7 +2276,7 @@ def verify_2fa():
 @login_required
 @email_verified_required
 def enable_2fa():
-    user = User.query.get(session['user_id'])
+    user = get_current_user()
     
     if request.method == 'POST':
         token = request.form.get('token', '').strip()
@@ -471,30 +2294,44 @@ def enable_2fa():
         user.generate_2fa_secret()
         db.session.commit()
     
-    # Generate QR code
-    qr_uri = user.get_totp_uri()
-    qr = qrcode.make(qr_uri)
-    buf = io.BytesIO()
-    qr.save(buf, format='PNG')
-    buf.seek(0)
-    qr_code_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
+    # The QR code itself is rendered (and cached) by totp_qr_code
+    qr_code_url = url_for('totp_qr_code', fmt=app.config['TOTP_QR_FORMAT'], v=qr_code_version(user))
     
     return render_template('enable_2fa.html', 
-                         qr_code=qr_code_base64, 
+                         qr_code_url=qr_code_url, 
                          secret=user.two_fa_secret)
 
+@app.route('/enable-2fa/qr-code.<fmt>')
+@login_required
+@email_verified_required
+def totp_qr_code(fmt):
+    user = get_current_user()
+    if fmt not in QR_FORMATS or not user.two_fa_secret:
+        return jsonify({'error': 'Not found'}), 404
+
+    body, etag = get_qr_code(user, fmt)
+    response = app.response_class(body, mimetype=QR_FORMATS[fmt])
+    response.set_etag(etag)
+    # The URL changes with the secret, so the image can be cached, but only by the user's browser
+    response.cache_control.private = True
+    response.cache_control.max_age = 86400
+    response.vary.add('Cookie')
+    return response.make_conditional(request)
+
 @app.route('/disable-2fa', methods=['POST'])
 @login_required
 @email_verified_required
 def disable_2fa():
-    user = User.query.get(session['user_id'])
+    user = get_current_user()
     user.two_fa_enabled = False
     user.two_fa_secret = None
     db.session.commit()
+    discard_qr_codes(user.id)
     flash('2FA has been disabled.', 'info')
     return redirect(url_for('dashboard'))
 
 @app.route('/forgot-password', methods=['GET', 'POST'])
+@cached_page
 def forgot_password():
     if request.method == 'POST':
         email = request.form.get('email', '').strip().lower()
@@ -519,7 +2356,7 @@ This link will expire in 1 hour.
 
 If you did not make this request, please ignore this email.
 '''
-                mail.send(msg)
+                queue_mail(msg)
                 flash('Password reset instructions have been sent to your email.', 'info')
             except Exception as e:
                 flash('Error sending email. Please try again later.', 'error')
@@ -556,6 +2393,7 @@ def reset_password(token):
         if user:
             user.set_password(password)
             db.session.commit()
+            revoke_sessions(user.id)
             flash('Your password has been reset successfully!', 'success')
             return redirect(url_for('login'))
     
@@ -567,15 +2405,32 @@ def logout():
     flash('You have been logged out.', 'info')
     return redirect(url_for('index'))
 
+@app.route('/logout-all', methods=['POST'])
+@login_required
+def logout_all():
+    count = revoke_sessions(session['user_id'])
+    session.clear()
+    flash(f'You have been logged out of {count} session(s).', 'info')
+    return redirect(url_for('login'))
+
 @app.route('/publish')
 @login_required
 @email_verified_required
 def publish():
-    projects = Project.query.order_by(Project.created_at.desc()).all()
-    blog_posts = BlogPost.query.order_by(BlogPost.created_at.desc()).all()
+    try:
+        projects, projects_cursor = paginate_entries(
+            Project.query.options(defer(Project.details)), Project,
+            cursor=request.args.get('projects_cursor'), limit=PUBLISH_PAGE_SIZE)
+        blog_posts, posts_cursor = paginate_entries(
+            BlogPost.query.options(defer(BlogPost.content)), BlogPost,
+            cursor=request.args.get('posts_cursor'), limit=PUBLISH_PAGE_SIZE)
+    except ValueError:
+        return redirect(url_for('publish'))
     return render_template('publish.html', 
                          projects=projects, 
-                         blog_posts=blog_posts)
+                         blog_posts=blog_posts,
+                         projects_cursor=projects_cursor,
+                         posts_cursor=posts_cursor)
 
 @app.route('/add/<content_type>', methods=['GET', 'POST'])
 @login_required
@@ -590,12 +2445,12 @@ def add_content(content_type):
                 project = Project(
                     title=request.form['title'],
                     description=request.form['description'],
-                    tech=request.form['tech'],
                     image=request.form['image'],
                     cover=request.form['cover'],
                     source=request.form['source'],
                     details=request.form['details']
                 )
+                project.set_tech(request.form['tech'])
                 db.session.add(project)
                 db.session.commit()
             else:
@@ -634,7 +2489,7 @@ def edit_content(content_type, entry_id):
             if content_type == 'project':
                 entry.title = request.form['title']
                 entry.description = request.form['description']
-                entry.tech = request.form['tech']
+                entry.set_tech(request.form['tech'])
                 entry.image = request.form['image']
                 entry.cover = request.form['cover']
                 entry.source = request.form['source']
@@ -683,18 +2538,52 @@ def delete_content(content_type, entry_id):
 def serve_data():
     """Serve data from database as JSON (maintains compatibility with existing endpoint)"""
     try:
-        projects = Project.query.order_by(Project.created_at.desc()).all()
-        blog_posts = BlogPost.query.order_by(BlogPost.created_at.desc()).all()
-        
-        data = {
-            'projects': [project.to_dict() for project in projects],
-            'blogPosts': [post.to_dict() for post in blog_posts]
-        }
-        
-        return jsonify(data)
+        version, body, etag = get_data_snapshot()
+        encoding = negotiate_encoding()
+        if encoding:
+            body = get_encoded_snapshot(version, body, encoding)
+            etag = f'{etag}-{encoding}'
+        response = app.response_class(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config['DATA_JSON_MAX_AGE']
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/metrics')
+@limiter.exempt
+def metrics():
+    """Prometheus metrics for this worker process"""
+    token = app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    with password_metrics_lock:
+        password_stats = {operation: dict(password_metrics[operation]) for operation in ('hash', 'check')}
+        queue_depth = password_metrics['queue_depth']
+        max_queue_depth = password_metrics['max_queue_depth']
+    outbox = db.session.query(MailOutbox.status, db.func.count()).group_by(MailOutbox.status).all()
+
+    gauges = [
+        ('password_operations_total', 'counter', 'bcrypt hashes and checks',
+         [((('operation', op),), stats['count']) for op, stats in password_stats.items()]),
+        ('password_seconds_total', 'counter', 'Time callers waited for bcrypt, including queueing',
+         [((('operation', op),), stats['seconds_total']) for op, stats in password_stats.items()]),
+        ('password_compute_seconds_total', 'counter', 'Time spent computing bcrypt in the pool',
+         [((('operation', op),), stats['compute_seconds_total']) for op, stats in password_stats.items()]),
+        ('password_queue_depth', 'gauge', 'Requests waiting for or running a bcrypt operation',
+         [((), queue_depth)]),
+        ('password_max_queue_depth', 'gauge', 'Highest password_queue_depth seen',
+         [((), max_queue_depth)]),
+        ('mail_outbox_messages', 'gauge', 'Messages in the mail outbox by status',
+         [((('status', status),), count) for status, count in outbox]),
+    ]
+    return app.response_class(render_metrics(gauges), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/contact', methods=['POST'])
 def handle_contact():
     try:
@@ -722,7 +2611,7 @@ def handle_contact():
             Message: {message}
             """
         )
-        mail.send(msg)
+        queue_mail(msg)
         return jsonify({'success': True}), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -731,7 +2620,7 @@ def handle_contact():
 @login_required
 @email_verified_required
 def dashboard():
-    user = User.query.get(session['user_id'])
+    user = get_current_user()
     return render_template('dashboard.html', user=user)
 
 # API Routes
@@ -744,12 +2633,12 @@ def create_project():
         project = Project(
             title=data['title'],
             description=data['description'],
-            tech=data['tech'],
             image=data['image'],
             cover=data['cover'],
             source=data['source'],
             details=data['details']
         )
+        project.set_tech(data['tech'])
         db.session.add(project)
         db.session.commit()
         return jsonify(project.to_dict()), 201
@@ -757,11 +2646,604 @@ def create_project():
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/projects', methods=['GET'])
+@read_only
+def list_projects():
+    query = Project.query
+    tech = request.args.get('tech', '').strip().lower()
+    if tech:
+        # Resolved through the tag.slug and project_tag.tag_id indexes
+        tagged = db.select(ProjectTag.project_id).join(Tag).where(Tag.slug == tech)
+        query = query.filter(Project.id.in_(tagged))
+    return list_entries_response(Project, query)
+
 @app.route('/api/project/<project_id>', methods=['GET'])
+@read_only
 def get_project(project_id):
     project = Project.query.get_or_404(project_id)
     return jsonify(project.to_dict())
 
+# Outbound fetches
+# Project details and entry images are URLs entered by users but fetched by
+# the server. Only hosts on an allowlist are fetched, and never when they
+# resolve to a private, loopback or link-local address, so the back end
+# cannot be pointed at internal services or cloud metadata endpoints.
+# Redirects are checked the same way before they are followed.
+class BlockedURLError(ValueError):
+    pass
+
+def check_outbound_url(url, allowed_hosts):
+    parts = urllib.parse.urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if parts.scheme not in ('http', 'https') or not host:
+        raise BlockedURLError(f'Not an http(s) URL: {url}')
+    if host not in allowed_hosts:
+        raise BlockedURLError(f'Host not allowed: {host}')
+    try:
+        addresses = socket.getaddrinfo(host, parts.port or (443 if parts.scheme == 'https' else 80),
+                                       proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, ValueError) as e:
+        raise BlockedURLError(f'Cannot resolve {host}: {e}')
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split('%')[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global:
+            raise BlockedURLError(f'{host} resolves to a non-public address')
+
+class CheckedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    def __init__(self, allowed_hosts):
+        super().__init__()
+        self.allowed_hosts = allowed_hosts
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        check_outbound_url(newurl, self.allowed_hosts)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+def open_outbound_url(url, allowed_hosts, headers, timeout):
+    check_outbound_url(url, allowed_hosts)
+    opener = urllib.request.build_opener(CheckedRedirectHandler(allowed_hosts))
+    return opener.open(urllib.request.Request(url, headers=headers), timeout=timeout)
+
+# Project details rendering
+# Project details usually point at a README on GitHub. The Markdown is
+# fetched once, rendered to HTML and kept in a disk-backed LRU cache together
+# with the upstream ETag/Last-Modified. Stale entries are still served while
+# a background thread revalidates them with a conditional request.
+# Details that are not a README URL are rendered as Markdown too. Raw HTML
+# in the Markdown is escaped and only http(s), mailto and relative links are
+# kept, so the output is safe to serve from the admin origin.
+DETAILS_CACHE_DIR = os.path.join(app.instance_path, 'details_cache')
+DETAILS_FETCH_TIMEOUT = 10
+DETAILS_RENDER_VERSION = 2  # Part of the cache key; bump when render_markdown changes
+SAFE_LINK_SCHEMES = ('http', 'https', 'mailto', '')
+_details_refreshing = set()
+_details_refreshing_lock = threading.Lock()
+
+def details_markdown_url(details):
+    if not details or not details.startswith(('http://', 'https://')) or not details.endswith('.md'):
+        return None
+    if urllib.parse.urlsplit(details).hostname not in app.config['DETAILS_ALLOWED_HOSTS']:
+        return None
+    if 'github.com' in details and '/blob/' in details:
+        return details.replace('github.com', 'raw.githubusercontent.com', 1).replace('/blob/', '/', 1)
+    return details
+
+def safe_link(match):
+    url = re.sub(r'[\x00-\x20]', '', Markup(match.group(2)).unescape())
+    if urllib.parse.urlsplit(url).scheme.lower() in SAFE_LINK_SCHEMES:
+        return match.group(0)
+    return f'{match.group(1)}="#"'
+
+def render_markdown(source):
+    """Markdown to HTML with raw HTML escaped and unsafe link schemes removed"""
+    import markdown
+    md = markdown.Markdown(extensions=['fenced_code', 'tables'])
+    md.preprocessors.deregister('html_block')
+    md.inlinePatterns.deregister('html')
+    return re.sub(r'\b(href|src)="([^"]*)"', safe_link, md.convert(source))
+
+def details_cache_paths(url):
+    key = hashlib.sha256(f'{DETAILS_RENDER_VERSION}:{url}'.encode('utf-8')).hexdigest()
+    base = os.path.join(DETAILS_CACHE_DIR, key)
+    return base + '.html', base + '.json'
+
+def read_details_cache(url):
+    html_path, meta_path = details_cache_paths(url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(html_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+    except (OSError, ValueError):
+        return None, None
+    # Record the access so eviction drops the least recently used entries
+    os.utime(html_path)
+    return html, meta
+
+def write_details_cache(url, html, meta):
+    os.makedirs(DETAILS_CACHE_DIR, exist_ok=True)
+    html_path, meta_path = details_cache_paths(url)
+    for path, content in ((html_path, html), (meta_path, json.dumps(meta))):
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    evict_details_cache()
+
+def evict_details_cache():
+    try:
+        entries = [os.path.join(DETAILS_CACHE_DIR, name)
+                   for name in os.listdir(DETAILS_CACHE_DIR) if name.endswith('.html')]
+    except OSError:
+        return
+    excess = len(entries) - app.config['DETAILS_CACHE_MAX_ENTRIES']
+    if excess <= 0:
+        return
+    entries.sort(key=lambda path: os.stat(path).st_mtime if os.path.exists(path) else 0)
+    for html_path in entries[:excess]:
+        for path in (html_path, html_path[:-len('.html')] + '.json'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def fetch_details(url, meta=None):
+    """Fetch and render the Markdown; returns (html, meta), or (None, meta) if not modified"""
+    request_headers = {'User-Agent': 'yasserbdj96-portfolio', 'Accept': 'text/plain, text/markdown'}
+    if meta and meta.get('etag'):
+        request_headers['If-None-Match'] = meta['etag']
+    if meta and meta.get('last_modified'):
+        request_headers['If-Modified-Since'] = meta['last_modified']
+
+    try:
+        with timed('details_fetch'):
+            with open_outbound_url(url, app.config['DETAILS_ALLOWED_HOSTS'], request_headers,
+                                   DETAILS_FETCH_TIMEOUT) as response:
+                source = response.read().decode('utf-8', errors='replace')
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and meta:
+            return None, dict(meta, fetched_at=time.time())
+        raise
+
+    with timed('details_render'):
+        html = render_markdown(source)
+    return html, {'url': url, 'etag': etag, 'last_modified': last_modified, 'fetched_at': time.time()}
+
+def refresh_details(url, meta):
+    try:
+        html, new_meta = fetch_details(url, meta)
+        if html is None:
+            html, _ = read_details_cache(url)
+        if html is not None:
+            write_details_cache(url, html, new_meta)
+    except Exception as e:
+        print(f"Details refresh error ({url}): {e}")
+    finally:
+        with _details_refreshing_lock:
+            _details_refreshing.discard(url)
+
+def schedule_details_refresh(url, meta):
+    with _details_refreshing_lock:
+        if url in _details_refreshing:
+            return
+        _details_refreshing.add(url)
+    threading.Thread(target=refresh_details, args=(url, meta), daemon=True).start()
+
+def render_project_details(details, description):
+    """Rendered details HTML for a project, or None if the source cannot be fetched"""
+    url = details_markdown_url(details)
+    if url is None:
+        return render_markdown(details) if details else f'<p>{escape(description)}</p>'
+
+    html, meta = read_details_cache(url)
+    if html is None:
+        try:
+            html, meta = fetch_details(url)
+        except Exception as e:
+            print(f"Details fetch error ({url}): {e}")
+            return None
+        write_details_cache(url, html, meta)
+    elif time.time() - meta.get('fetched_at', 0) > app.config['DETAILS_CACHE_TTL']:
+        schedule_details_refresh(url, meta)
+    return html
+
+DETAILS_HEADERS = {
+    # The fragment is meant to be fetched and inserted by the portfolio; opened
+    # directly it must not run anything on this origin
+    'Content-Security-Policy': "sandbox; default-src 'none'",
+    'X-Content-Type-Options': 'nosniff',
+}
+
+@app.route('/api/project/<project_id>/details.html', methods=['GET'])
+@cross_origin(origins=app.config['PUBLIC_SITE_ORIGINS'])
+def get_project_details(project_id):
+    project = Project.query.options(load_only(Project.details, Project.description)).get_or_404(project_id)
+    html = render_project_details(project.details, project.description)
+    if html is None:
+        return ('<p>Failed to load project details.</p>', 502,
+                dict(DETAILS_HEADERS, **{'Content-Type': 'text/html; charset=utf-8'}))
+
+    response = app.response_class(html, mimetype='text/html', headers=DETAILS_HEADERS)
+    response.set_etag(hashlib.sha256(html.encode('utf-8')).hexdigest()[:32])
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['DATA_JSON_MAX_AGE']
+    return response.make_conditional(request)
+
+# Image variants
+# Entry images point at full-size remote files. Each source URL is fetched
+# once and scaled down to a few fixed widths in a process pool, encoded as
+# AVIF or WebP when the browser accepts it and JPEG otherwise. Sources and
+# variants are named after the digest of the source bytes, so identical
+# images share files; the cache is evicted least recently used once it
+# grows past IMAGE_CACHE_MAX_BYTES. Stale sources are revalidated in the
+# background like project details. A ?v=<digest> matching the current
+# source makes the response immutable. Sources are only fetched from
+# IMAGE_ALLOWED_HOSTS (see Outbound fetches); other images are redirected to.
+IMAGE_CACHE_DIR = os.path.join(app.instance_path, 'image_cache')
+IMAGE_FETCH_TIMEOUT = 15
+IMAGE_MAX_AGE = 86400  # seconds, for unversioned URLs
+IMAGE_VARIANTS = {  # name -> (fields tried in order, max width)
+    'thumb': (('image', 'cover'), 480),
+    'card': (('image', 'cover'), 960),
+    'cover': (('cover', 'image'), 1600),
+}
+IMAGE_FORMAT_PREFERENCE = ('avif', 'webp')  # Used when the Accept header names them
+
+_image_pool = None
+_image_pool_lock = threading.Lock()
+_image_formats = None
+_image_jobs = {}  # variant file name -> Future
+_image_jobs_lock = threading.Lock()
+_image_refreshing = set()
+_image_refreshing_lock = threading.Lock()
+
+def get_image_pool():
+    global _image_pool
+    if _image_pool is None:
+        with _image_pool_lock:
+            if _image_pool is None:
+                _image_pool = ProcessPoolExecutor(max_workers=app.config['IMAGE_WORKERS'],
+                                                  mp_context=POOL_MP_CONTEXT)
+    return _image_pool
+
+def negotiate_image_format():
+    global _image_formats
+    import image_variants  # Pulls in PIL, so only load it when an image is served
+    if _image_formats is None:
+        _image_formats = image_variants.supported_formats()
+    accepted = {value for value, quality in request.accept_mimetypes if quality > 0}
+    for fmt in IMAGE_FORMAT_PREFERENCE:
+        if fmt in _image_formats and image_variants.FORMATS[fmt][1] in accepted:
+            return fmt
+    return 'jpeg'
+
+def image_meta_path(url):
+    return os.path.join(IMAGE_CACHE_DIR, 'sources', hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+def write_image_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def read_image_meta(url):
+    try:
+        with open(image_meta_path(url), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def fetch_image_source(url, meta=None):
+    """Download and store the source; returns its meta, refreshed if not modified"""
+    request_headers = {'User-Agent': 'yasserbdj96-portfolio', 'Accept': 'image/*'}
+    if meta and meta.get('etag'):
+        request_headers['If-None-Match'] = meta['etag']
+    if meta and meta.get('last_modified'):
+        request_headers['If-Modified-Since'] = meta['last_modified']
+    try:
+        with timed('image_fetch'):
+            with open_outbound_url(url, app.config['IMAGE_ALLOWED_HOSTS'], request_headers,
+                                   IMAGE_FETCH_TIMEOUT) as response:
+                data = response.read(app.config['IMAGE_MAX_SOURCE_BYTES'] + 1)
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and meta:
+            meta = dict(meta, fetched_at=time.time())
+            write_image_file(image_meta_path(url), json.dumps(meta).encode('utf-8'))
+            return meta
+        raise
+    if len(data) > app.config['IMAGE_MAX_SOURCE_BYTES']:
+        raise ValueError(f'Source image is larger than {app.config["IMAGE_MAX_SOURCE_BYTES"]} bytes')
+
+    digest = hashlib.sha256(data).hexdigest()
+    write_image_file(os.path.join(IMAGE_CACHE_DIR, digest + '.src'), data)
+    meta = {'url': url, 'digest': digest, 'etag': etag, 'last_modified': last_modified, 'fetched_at': time.time()}
+    write_image_file(image_meta_path(url), json.dumps(meta).encode('utf-8'))
+    evict_image_cache()
+    return meta
+
+def refresh_image_source(url, meta):
+    try:
+        fetch_image_source(url, meta)
+    except Exception as e:
+        print(f"Image refresh error ({url}): {e}")
+    finally:
+        with _image_refreshing_lock:
+            _image_refreshing.discard(url)
+
+def load_image_source(url):
+    """Digest of the stored source for url, fetching it on first use"""
+    meta = read_image_meta(url)
+    if meta is None:
+        return fetch_image_source(url)['digest']
+    if time.time() - meta.get('fetched_at', 0) > app.config['IMAGE_SOURCE_TTL']:
+        with _image_refreshing_lock:
+            refresh = url not in _image_refreshing
+            _image_refreshing.add(url)
+        if refresh:
+            threading.Thread(target=refresh_image_source, args=(url, meta), daemon=True).start()
+    return meta['digest']
+
+def get_image_variant(digest, width, fmt):
+    """Path of the variant, rendering it unless it is already cached"""
+    name = f'{digest}-{width}.{fmt}'
+    path = os.path.join(IMAGE_CACHE_DIR, name)
+    try:
+        os.utime(path)  # Record the access so eviction drops the least recently used files
+        return path
+    except OSError:
+        pass
+
+    # Concurrent requests for the same variant share one rendering
+    with _image_jobs_lock:
+        job = _image_jobs.get(name)
+        owner = job is None
+        if owner:
+            import image_variants
+            with open(os.path.join(IMAGE_CACHE_DIR, digest + '.src'), 'rb') as f:
+                source = f.read()
+            args = (source, width, fmt, app.config['IMAGE_QUALITY'])
+            if app.config['IMAGE_WORKERS'] > 0:
+                job = get_image_pool().submit(image_variants.make_variant, *args)
+            else:
+                job = Future()
+                job.set_result(image_variants.make_variant(*args))
+            _image_jobs[name] = job
+    try:
+        data, seconds = job.result()
+        if not os.path.exists(path):
+            write_image_file(path, data)
+        if owner:
+            record_timing('image_resize', seconds)
+    finally:
+        if owner:
+            with _image_jobs_lock:
+                _image_jobs.pop(name, None)
+    if owner:
+        evict_image_cache()
+    return path
+
+def evict_image_cache():
+    try:
+        files = [entry for entry in os.scandir(IMAGE_CACHE_DIR) if entry.is_file() and not entry.name.endswith('.tmp')]
+    except OSError:
+        return
+    stats = []
+    for entry in files:
+        try:
+            stats.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+        except OSError:
+            pass
+    total = sum(size for _, size, _ in stats)
+    if total <= app.config['IMAGE_CACHE_MAX_BYTES']:
+        return
+    # Evict down to 90% so the next few writes do not each trigger a scan
+    target = app.config['IMAGE_CACHE_MAX_BYTES'] * 0.9
+    for _, size, path in sorted(stats):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def entry_image_source(entry, variant):
+    fields, _ = IMAGE_VARIANTS[variant]
+    return next((url for url in (getattr(entry, field) for field in fields)
+                 if url and url.startswith(('http://', 'https://'))), None)
+
+def image_url(entry, variant):
+    """URL of an entry image variant, versioned when its source is already cached"""
+    url = entry_image_source(entry, variant)
+    if url is None:
+        return entry.image or entry.cover
+    meta = read_image_meta(url)
+    return url_for('entry_image', entry_id=entry.id, variant=variant,
+                   v=meta['digest'][:12] if meta else None)
+
+app.jinja_env.globals['image_url'] = image_url
+
+@app.route('/img/<entry_id>/<variant>', methods=['GET'])
+@limiter.exempt
+@read_only
+def entry_image(entry_id, variant):
+    if variant not in IMAGE_VARIANTS:
+        return jsonify({'error': 'Unknown image variant'}), 404
+    entry = None
+    for model in (Project, BlogPost):
+        entry = db.session.get(model, entry_id, options=[load_only(model.image, model.cover)])
+        if entry is not None:
+            break
+    url = entry_image_source(entry, variant) if entry is not None else None
+    if url is None:
+        return jsonify({'error': 'Image not found'}), 404
+
+    fmt = negotiate_image_format()
+    width = IMAGE_VARIANTS[variant][1]
+    try:
+        digest = load_image_source(url)
+        try:
+            path = get_image_variant(digest, width, fmt)
+        except FileNotFoundError:
+            # The source was evicted before this variant was rendered
+            digest = fetch_image_source(url)['digest']
+            path = get_image_variant(digest, width, fmt)
+    except Exception as e:
+        print(f"Image error ({url}): {e}")
+        return redirect(url)  # The full-size original is better than a broken image
+
+    immutable = request.args.get('v') == digest[:12]
+    import image_variants
+    response = send_file(path, mimetype=image_variants.FORMATS[fmt][1], etag=f'{digest[:16]}-{width}-{fmt}',
+                         max_age=31536000 if immutable else IMAGE_MAX_AGE, conditional=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = immutable or None
+    response.vary.add('Accept')
+    return response
+
+# GitHub stats
+# The profile counters shown on the portfolio come from GitHub's REST API,
+# which allows 60 unauthenticated requests per hour per IP. One thread per
+# worker refreshes them every GITHUB_STATS_TTL seconds with a conditional
+# request, and keeps the last good copy in memory and in the instance folder.
+# Workers share that file, so a refresh by one is picked up by the others
+# instead of calling GitHub again. Requests are always answered from the
+# stored copy; when it is stale they wake the refresh thread, and when GitHub
+# fails the stale copy keeps being served until a retry succeeds.
+GITHUB_STATS_FILE = os.path.join(app.instance_path, 'github_stats.json')
+GITHUB_FETCH_TIMEOUT = 10
+GITHUB_STATS_FIELDS = ('login', 'name', 'html_url', 'avatar_url', 'public_repos', 'public_gists',
+                       'followers', 'following')
+
+_github_stats = None  # {'stats', 'etag', 'fetched_at'}
+_github_stats_mtime = None
+_github_lock = threading.Lock()
+_github_fetch_lock = threading.Lock()  # One fetch at a time per worker
+_github_wakeup = threading.Event()
+_github_thread = None
+_github_retry_at = 0  # No refresh before this time after a failure
+
+def load_github_stats():
+    """Stored stats, reloaded when another worker has written a newer copy"""
+    global _github_stats, _github_stats_mtime
+    try:
+        mtime = os.stat(GITHUB_STATS_FILE).st_mtime_ns
+    except OSError:
+        return _github_stats
+    if mtime != _github_stats_mtime:
+        try:
+            with open(GITHUB_STATS_FILE, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with _github_lock:
+                _github_stats, _github_stats_mtime = entry, mtime
+        except (OSError, ValueError) as e:
+            print(f"GitHub stats file error: {e}")
+    return _github_stats
+
+def save_github_stats(entry):
+    global _github_stats, _github_stats_mtime
+    tmp_path = f'{GITHUB_STATS_FILE}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, GITHUB_STATS_FILE)
+    with _github_lock:
+        _github_stats, _github_stats_mtime = entry, os.stat(GITHUB_STATS_FILE).st_mtime_ns
+
+def fetch_github_stats(entry):
+    """Fetch the profile from GitHub, revalidating entry; returns the new entry"""
+    url = f"{app.config['GITHUB_API_URL'].rstrip('/')}/users/{app.config['GITHUB_USERNAME']}"
+    request_headers = {'User-Agent': 'yasserbdj96-portfolio', 'Accept': 'application/vnd.github+json'}
+    if app.config['GITHUB_TOKEN']:
+        request_headers['Authorization'] = f"Bearer {app.config['GITHUB_TOKEN']}"
+    if entry and entry.get('etag'):
+        request_headers['If-None-Match'] = entry['etag']
+    try:
+        with timed('github_fetch'):
+            with urllib.request.urlopen(urllib.request.Request(url, headers=request_headers),
+                                        timeout=GITHUB_FETCH_TIMEOUT) as response:
+                profile = json.loads(response.read().decode('utf-8'))
+                etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry:
+            return dict(entry, fetched_at=time.time())
+        raise
+    stats = {field: profile.get(field) for field in GITHUB_STATS_FIELDS}
+    return {'stats': stats, 'etag': etag, 'fetched_at': time.time()}
+
+def github_rate_limit_reset(error):
+    """When GitHub says the rate limit resets, for a rate-limited response"""
+    if isinstance(error, urllib.error.HTTPError) and error.code in (403, 429):
+        if error.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                return float(error.headers.get('X-RateLimit-Reset'))
+            except (TypeError, ValueError):
+                pass
+    return None
+
+def refresh_github_stats():
+    """Refresh the stored stats unless another worker already did"""
+    global _github_retry_at
+    with _github_fetch_lock:
+        entry = load_github_stats()
+        if entry is not None and time.time() - entry['fetched_at'] < app.config['GITHUB_STATS_TTL']:
+            return entry
+        if time.time() < _github_retry_at:
+            return entry
+        try:
+            entry = fetch_github_stats(entry)
+            save_github_stats(entry)
+            _github_retry_at = 0
+            increment('github_stats_refresh_total', result='ok')
+        except Exception as e:
+            print(f"GitHub stats refresh error: {e}")
+            increment('github_stats_refresh_total', result='error')
+            _github_retry_at = max(time.time() + app.config['GITHUB_STATS_RETRY'], github_rate_limit_reset(e) or 0)
+        return entry
+
+def run_github_refresher():
+    while True:
+        entry = refresh_github_stats()
+        due = entry['fetched_at'] + app.config['GITHUB_STATS_TTL'] if entry else 0
+        _github_wakeup.wait(max(due, _github_retry_at) - time.time())
+        _github_wakeup.clear()
+
+def start_github_refresher():
+    global _github_thread
+    with _github_lock:
+        if _github_thread is None or not _github_thread.is_alive():
+            _github_thread = threading.Thread(target=run_github_refresher, name='github-stats', daemon=True)
+            _github_thread.start()
+
+@app.route('/api/github-stats', methods=['GET'])
+@limiter.exempt
+@cross_origin(origins=app.config['PUBLIC_SITE_ORIGINS'])
+def github_stats():
+    """GitHub profile counters, served from the stored copy"""
+    start_github_refresher()
+    entry = load_github_stats()
+    if entry is None:
+        entry = refresh_github_stats()  # Nothing stored yet: wait for the first fetch
+        if entry is None:
+            return jsonify({'error': 'GitHub stats are not available yet'}), 503
+
+    age = time.time() - entry['fetched_at']
+    stale = age >= app.config['GITHUB_STATS_TTL']
+    if stale:
+        _github_wakeup.set()
+    fetched_at = datetime.utcfromtimestamp(entry['fetched_at']).isoformat()
+    response = jsonify({'stats': entry['stats'], 'fetchedAt': fetched_at, 'stale': stale})
+    response.set_etag(hashlib.sha256(json.dumps(entry['stats'], sort_keys=True).encode('utf-8')).hexdigest()[:32])
+    response.cache_control.public = True
+    response.cache_control.max_age = max(60, int(app.config['GITHUB_STATS_TTL'] - age))
+    response.cache_control.stale_while_revalidate = app.config['GITHUB_STATS_TTL']
+    return response.make_conditional(request)
+
 @app.route('/api/project/<project_id>', methods=['PUT'])
 @login_required
 @email_verified_required
@@ -772,7 +3254,8 @@ def update_project(project_id):
         
         project.title = data.get('title', project.title)
         project.description = data.get('description', project.description)
-        project.tech = data.get('tech', project.tech)
+        if 'tech' in data:
+            project.set_tech(data['tech'])
         project.image = data.get('image', project.image)
         project.cover = data.get('cover', project.cover)
         project.source = data.get('source', project.source)
@@ -820,7 +3303,17 @@ def create_blog():
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/blog-posts', methods=['GET'])
+@read_only
+def list_blog_posts():
+    query = BlogPost.query
+    category = request.args.get('category', '').strip()
+    if category:
+        query = query.filter(BlogPost.category == category)
+    return list_entries_response(BlogPost, query)
+
 @app.route('/api/blog/<blog_id>', methods=['GET'])
+@read_only
 def get_blog(blog_id):
     blog = BlogPost.query.get_or_404(blog_id)
     return jsonify(blog.to_dict())
@@ -861,5 +3354,305 @@ def delete_blog(blog_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/changes', methods=['GET'])
+@read_only
+def list_changes():
+    try:
+        since = parse_change_cursor(request.args.get('since', '').strip())
+        limit = max(1, min(request.args.get('limit', MAX_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    changes, cursor, has_more = get_changes(since, limit)
+    return jsonify({'changes': changes, 'cursor': cursor, 'has_more': has_more})
+
+@app.route('/api/stream', methods=['GET'])
+@limiter.exempt
+def stream():
+    last_id = request.headers.get('Last-Event-ID', request.args.get('since', '')).strip()
+    if last_id and not last_id.isdigit():
+        return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+    if async_worker():
+        max_clients, max_duration = app.config['STREAM_MAX_CLIENTS'], None
+    elif request.environ.get('wsgi.multithread'):
+        max_clients = min(app.config['STREAM_MAX_CLIENTS'], app.config['STREAM_THREADED_MAX_CLIENTS'])
+        max_duration = app.config['STREAM_THREADED_MAX_DURATION']
+    else:
+        max_clients, max_duration = 0, None
+    # Started before the client is counted, so a failure here cannot leak a slot
+    stream_hub.start()
+    if not stream_hub.connect(max_clients):
+        response = jsonify({'error': 'Too many stream clients, try again later'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '30'
+        return response
+    response = app.response_class(stream_hub.subscribe(int(last_id) if last_id else None, max_duration),
+                                  mimetype='text/event-stream')
+    response.call_on_close(stream_hub.disconnect)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Let nginx pass events through as they are written
+    return response
+
+@app.route('/api/search', methods=['GET'])
+@read_only
+def search():
+    q = request.args.get('q', '').strip()
+    kind = request.args.get('type', '').strip() or None
+    if not q:
+        return jsonify({'error': "Missing 'q'"}), 400
+    if kind and kind not in SEARCH_KINDS:
+        return jsonify({'error': f"Unknown type: {kind!r}"}), 400
+
+    limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+    offset = 0
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            offset = max(0, int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))))
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+    # Ranked results can't be keyset-paginated, so the cursor is an offset
+    results = search_entries(q, kind, limit + 1, offset)
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = base64.urlsafe_b64encode(str(offset + limit).encode('ascii')).decode('ascii').rstrip('=')
+    return jsonify({'items': results, 'next_cursor': next_cursor})
+
+@app.route('/api/bulk', methods=['POST'])
+@login_required
+@email_verified_required
+def bulk_import():
+    """Upsert projects and blog posts from an NDJSON body.
+
+    Each line is an object with "type" ("project" or "blog") plus the same
+    fields as the single-item API. The response streams one NDJSON line per
+    rejected row followed by a summary line.
+    """
+    def parse_lines():
+        for line, raw in enumerate(iter_lines(request.stream), 1):
+            if not raw.strip():
+                continue
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                yield line, data.pop('type', None), data
+            else:
+                yield line, None, None
+
+    def generate():
+        summary = {'created': 0, 'updated': 0, 'skipped': 0, 'error': 0}
+        for result in import_entries(parse_lines()):
+            summary[result['status']] += 1
+            if result['status'] == 'error':
+                yield json.dumps(result) + '\n'
+        yield json.dumps({'summary': summary}) + '\n'
+
+    return app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/export', methods=['GET'])
+@login_required
+@email_verified_required
+def bulk_export():
+    """Stream every project and blog post as NDJSON, in pages of BULK_CHUNK_SIZE"""
+    types = [t for t in request.args.get('type', 'project,blog').split(',') if t in BULK_MODELS]
+
+    def generate():
+        for entry_type in types:
+            model = BULK_MODELS[entry_type]
+            cursor = None
+            while True:
+                entries, cursor = paginate_entries(model.query.options(*entry_load_options(model)), model,
+                                                   cursor=cursor, limit=BULK_CHUNK_SIZE)
+                for entry in entries:
+                    data = entry.to_dict()
+                    data['type'] = entry_type
+                    if entry.created_at:
+                        data['createdAt'] = entry.created_at.isoformat()
+                    yield json.dumps(data, ensure_ascii=False) + '\n'
+                db.session.expunge_all()
+                if cursor is None:
+                    break
+
+    return app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# CLI commands
+def hot_queries():
+    """The queries issued on every login, registration and listing request"""
+    return [
+        ('login / forgot-password / verify-email: user by email',
+         User.query.filter_by(email='user@example.com').limit(1)),
+        ('register: user by username',
+         User.query.filter_by(username='user').limit(1)),
+        ('protected routes: user by id',
+         User.query.filter_by(id=1)),
+        ('/data.json, /publish: projects newest first',
+         Project.query.order_by(Project.created_at.desc(), Project.id.desc()).limit(DEFAULT_PAGE_SIZE + 1)),
+        ('/data.json, /publish: blog posts newest first',
+         BlogPost.query.order_by(BlogPost.created_at.desc(), BlogPost.id.desc()).limit(DEFAULT_PAGE_SIZE + 1)),
+        ('/api/projects?cursor=: next page',
+         Project.query.filter(keyset_filter(Project, datetime.utcnow(), ''))
+         .order_by(Project.created_at.desc(), Project.id.desc()).limit(DEFAULT_PAGE_SIZE + 1)),
+        ('/api/projects?tech=: projects by tag',
+         Project.query.filter(Project.id.in_(
+             db.select(ProjectTag.project_id).join(Tag).where(Tag.slug == 'flask')
+         )).order_by(Project.created_at.desc(), Project.id.desc()).limit(DEFAULT_PAGE_SIZE + 1)),
+        ('/api/blog-posts?category=: posts by category',
+         BlogPost.query.filter(BlogPost.category == 'python')
+         .order_by(BlogPost.created_at.desc(), BlogPost.id.desc()).limit(DEFAULT_PAGE_SIZE + 1)),
+        ('mail queue: next due message',
+         MailOutbox.query.filter(MailOutbox.status.in_(['pending', 'sending']),
+                                 MailOutbox.next_attempt_at <= datetime.utcnow())
+         .order_by(MailOutbox.next_attempt_at).limit(1)),
+    ]
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create tables and indexes and import data.json."""
+    setup_database(force=True)
+    print('Database initialized.')
+
+@app.cli.command('migrate-json')
+@click.option('--file', 'path', default=DATA_FILE, show_default=True,
+              help='JSON file with "projects" and "blogPosts" to import.')
+def migrate_json_command(path):
+    """Import projects and blog posts that are not in the database yet."""
+    if not os.path.exists(path):
+        raise click.ClickException(f'{path} does not exist')
+    init_db()
+    migrate_json_to_db(path)
+    migrate_tech_tags()
+
+@app.cli.command('search-reindex')
+def search_reindex_command():
+    """Rebuild the full-text search index from scratch."""
+    setup_database()
+    rebuild_search_index()
+    print(f'Search index rebuilt ({search_backend()}).')
+
+@app.cli.command('revoke-sessions')
+@click.option('--email', required=True, help='Account whose sessions are ended.')
+def revoke_sessions_command(email):
+    """Log a user out of every browser."""
+    setup_database()
+    user = User.query.filter_by(email=email.strip().lower()).first()
+    if user is None:
+        raise click.ClickException(f'No user with email {email}')
+    print(f"Revoked {revoke_sessions(user.id)} session(s) for {user.email}.")
+
+@app.cli.command('precompress')
+@click.option('--dir', 'directories', multiple=True,
+              default=[app.static_folder, os.path.join('..', 'Front-End', 'static')], show_default=True,
+              help='Directory to precompress; may be given several times.')
+def precompress_command(directories):
+    """Write .gz (and .br with Brotli installed) next to static text assets."""
+    written = 0
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if (os.path.splitext(name)[1] in PRECOMPRESS_EXTENSIONS
+                        and os.path.getsize(path) >= app.config['COMPRESS_MIN_SIZE']):
+                    written += precompress_file(path)
+    print(f"Wrote {written} compressed file(s) ({', '.join(available_encodings())}).")
+
+@app.cli.command('db-explain')
+def db_explain():
+    """Print the query plan of every hot query."""
+    setup_database()
+    dialect = db.engine.dialect
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+    with db.engine.connect() as conn:
+        for name, query in hot_queries():
+            compiled = query.statement.compile(dialect=dialect, compile_kwargs={'render_postcompile': True})
+            params = compiled.params
+            if compiled.positional:
+                params = tuple(params[key] for key in compiled.positiontup)
+            print(f'-- {name}')
+            for row in conn.exec_driver_sql(prefix + str(compiled), params):
+                # SQLite returns (id, parent, notused, detail); others a single text column
+                print(f'   {row[-1]}')
+            print()
+
+PRICING_FILE = 'pricing.json'
+EXPORT_MANIFEST = '.export-manifest.json'
+
+def write_if_changed(output, relative_path, content, manifest, written):
+    """Write content unless the manifest shows the same bytes are already there"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()
+    path = os.path.join(output, relative_path)
+    written[relative_path] = digest
+    if manifest.get(relative_path) == digest and os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return True
+
+@app.cli.command('export-static')
+@click.option('--output', default=os.path.join('..', 'Front-End'), show_default=True,
+              help='Directory of the static site to write into.')
+def export_static(output):
+    """Render data.json, pricing.json and one page per project/post."""
+    setup_database()
+    manifest_path = os.path.join(output, EXPORT_MANIFEST)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    written = {}
+    changed = []
+
+    def export(relative_path, content):
+        if write_if_changed(output, relative_path, content, manifest, written):
+            changed.append(relative_path)
+
+    version, body, etag = get_data_snapshot()
+    export('data.json', body)
+    data = json.loads(body)
+
+    if os.path.exists(PRICING_FILE):
+        with open(PRICING_FILE, 'rb') as f:
+            pricing = f.read()
+        json.loads(pricing)  # refuse to publish a broken file
+        export('pricing.json', pricing)
+
+    # Templates expect a request (context processors read the session)
+    with app.test_request_context():
+        for project in data['projects']:
+            if not ENTRY_ID_PATTERN.fullmatch(project['id']):
+                print(f"Skipping project with unsafe id: {project['id']!r}")
+                continue
+            details_html = render_project_details(project['details'], project['description'])
+            export(f"projects/{project['id']}.html",
+                   render_template('export/entry.html', kind='project', entry=project,
+                                   details_html=details_html))
+        for post in data['blogPosts']:
+            if not ENTRY_ID_PATTERN.fullmatch(post['id']):
+                print(f"Skipping blog post with unsafe id: {post['id']!r}")
+                continue
+            export(f"blog/{post['id']}.html",
+                   render_template('export/entry.html', kind='post', entry=post))
+
+    # Remove pages of entries that have been deleted since the last export
+    removed = [path for path in manifest if path not in written]
+    for path in removed:
+        try:
+            os.remove(os.path.join(output, path))
+        except OSError:
+            pass
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(written, f, indent=2, sort_keys=True)
+
+    print(f"Exported {len(written)} file(s) to {output}: "
+          f"{len(changed)} written, {len(written) - len(changed)} unchanged, {len(removed)} removed.")
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
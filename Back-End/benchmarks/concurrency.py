@@ -0,0 +1,138 @@
+"""Readers against a concurrent writer: SQLite WAL versus the rollback journal.
+
+For each journal mode a fresh interpreter runs in a scratch copy of the back
+end with its own database. One thread keeps opening write transactions that
+insert a batch of projects and hold the write lock for --hold seconds before
+committing, while --readers threads request /api/projects through the test
+client. With WAL, readers never wait for the writer, so the slowest read must
+stay well below the hold time and no request may fail; the script exits with
+status 1 when that does not hold.
+
+Usage (from Back-End/):
+    python benchmarks/concurrency.py [--duration 5] [--readers 4] [--hold 0.5]
+                                     [--modes WAL DELETE] [--json FILE]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from startup import HERE, make_copy
+
+
+def child(args):
+    import app
+
+    app.limiter.enabled = False
+    client = app.app.test_client()
+    client.get('/api/projects?limit=1')  # Creates the database
+    stop = threading.Event()
+    reads, read_errors, writes, write_errors = [], [0], [0], [0]
+    lock = threading.Lock()
+
+    def writer():
+        details = 'x' * 4096  # Large enough to spill the page cache inside the transaction
+        with app.app.app_context():
+            while not stop.is_set():
+                try:
+                    app.db.session.execute(app.db.insert(app.Project), [
+                        {'id': str(uuid.uuid4()), 'title': 'Concurrency', 'description': '', 'tech': '',
+                         'image': '', 'cover': '', 'source': '', 'details': details}
+                        for _ in range(args.batch)])
+                    time.sleep(args.hold)
+                    app.db.session.commit()
+                    writes[0] += 1
+                except Exception as e:
+                    app.db.session.rollback()
+                    write_errors[0] += 1
+                    print(f'write failed: {e}', file=sys.stderr)
+
+    def reader():
+        local = app.app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = local.get('/api/projects?limit=20')
+            elapsed = time.perf_counter() - start
+            with lock:
+                reads.append(elapsed)
+                read_errors[0] += response.status_code != 200
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    reads.sort()
+    print(json.dumps({
+        'reads': len(reads),
+        'read_errors': read_errors[0],
+        'read_p50_ms': statistics.median(reads) * 1000,
+        'read_p99_ms': reads[min(len(reads) - 1, int(len(reads) * 0.99))] * 1000,
+        'read_max_ms': reads[-1] * 1000,
+        'write_transactions': writes[0],
+        'write_errors': write_errors[0],
+    }))
+
+
+def run_mode(args, mode):
+    directory = make_copy(args.source, None)
+    try:
+        env = dict(os.environ, PYTHONPATH=directory, MAIL_QUEUE_WORKERS='1', SQLITE_JOURNAL_MODE=mode)
+        env.pop('DATABASE_URL', None)
+        env.pop('DATABASE_READ_URL', None)
+        command = [sys.executable, os.path.abspath(__file__), '--child',
+                   '--duration', str(args.duration), '--readers', str(args.readers),
+                   '--hold', str(args.hold), '--batch', str(args.batch)]
+        output = subprocess.run(command, cwd=directory, env=env, capture_output=True, text=True, check=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=5, help='seconds per journal mode')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--hold', type=float, default=0.5, help='seconds each write transaction stays open')
+    parser.add_argument('--batch', type=int, default=1000, help='rows inserted per write transaction')
+    parser.add_argument('--modes', nargs='+', default=['WAL', 'DELETE'])
+    parser.add_argument('--source', default=HERE, help='back end directory to benchmark')
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    results = {}
+    for mode in args.modes:
+        result = results[mode] = run_mode(args, mode)
+        print(f'{mode:<8} reads {result["reads"]:6d}  p50 {result["read_p50_ms"]:8.2f} ms  '
+              f'p99 {result["read_p99_ms"]:8.2f} ms  max {result["read_max_ms"]:8.2f} ms  '
+              f'read errors {result["read_errors"]}  writes {result["write_transactions"]} '
+              f'({result["write_errors"]} failed)')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+
+    wal = results.get('WAL')
+    if wal:
+        blocked = wal['read_max_ms'] >= args.hold * 1000 / 2
+        if blocked or wal['read_errors'] or wal['write_errors'] or not wal['write_transactions']:
+            print('FAIL: in WAL mode reads waited for the writer or requests failed')
+            sys.exit(1)
+        print(f'OK: no read waited for the {args.hold * 1000:.0f} ms write transactions in WAL mode')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Per-hit overhead of the rate limit storage backends.
+
+Usage (from Back-End/):
+    python benchmarks/rate_limit.py [--hits 20000] [--storage memory:// sqlite:///...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rate_limit_storage  # noqa: F401  (registers sqlite://)
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+
+def bench(uri, strategy, hits, keys):
+    storage = storage_from_string(uri)
+    limiter = STRATEGIES[strategy](storage)
+    item = parse('5 per minute')
+    storage.reset()
+    start = time.perf_counter()
+    for i in range(hits):
+        limiter.hit(item, f'10.0.{i % keys // 256}.{i % 256}')
+    elapsed = time.perf_counter() - start
+    return elapsed / hits * 1e6
+
+
+def main():
+    default_sqlite = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'ratelimit.db')
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hits', type=int, default=20000)
+    parser.add_argument('--keys', type=int, default=1000, help='distinct client addresses')
+    parser.add_argument('--storage', nargs='+', default=['memory://', default_sqlite])
+    parser.add_argument('--strategy', nargs='+', default=['fixed-window', 'sliding-window-counter', 'moving-window'])
+    args = parser.parse_args()
+
+    print(f'{"storage":<12} {"strategy":<24} {"us/hit":>8}')
+    for uri in args.storage:
+        for strategy in args.strategy:
+            micros = bench(uri, strategy, args.hits, args.keys)
+            print(f'{uri.split(":")[0]:<12} {strategy:<24} {micros:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""Latency, throughput and memory of the main routes on a seeded database.
+
+The back end is copied to a scratch directory with its own database, seeded
+with --users/--projects/--posts rows, and each scenario is driven twice:
+sequentially through the Flask test client (pure application cost), and
+through a threaded Werkzeug server with --concurrency clients over real
+sockets. Results are written as JSON, tagged with the git commit, so runs
+can be compared:
+
+Usage (from Back-End/):
+    python benchmarks/routes.py [--projects 2000 --posts 2000 --users 500]
+                                [--requests 500 --concurrency 8] [--output FILE]
+    python benchmarks/routes.py --compare OLD.json NEW.json
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from startup import HERE, make_copy
+
+PASSWORD = 'benchmark-password'
+SCENARIOS = ('data_json', 'login', 'publish', 'project', 'blog')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed, rss_before, rss_after):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'throughput_rps': len(latencies) / elapsed,
+        'rss_before_mb': rss_before,
+        'rss_after_mb': rss_after,
+    }
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(app, users, projects, posts):
+    """Insert benchmark rows; returns (emails, project ids, post ids)
+
+    Only the models and columns every version of app.py has are used, so
+    --source can point at a checkout of an older commit.
+    """
+    # Older versions create the tables on import, newer ones on the first request
+    app.app.test_client().get('/data.json')
+    with app.app.app_context():
+        emails = [f'bench{i}@example.com' for i in range(users)]
+        # One real hash shared by every user keeps seeding fast
+        first = app.User(username='bench0', email=emails[0], email_verified=True)
+        first.set_password(PASSWORD)
+        app.db.session.add(first)
+        app.db.session.commit()
+        app.db.session.execute(app.db.insert(app.User), [
+            {'username': f'bench{i}', 'email': email, 'password_hash': first.password_hash,
+             'email_verified': True}
+            for i, email in enumerate(emails[1:], 1)])
+        app.db.session.commit()
+
+        words = ('flask sqlite python cache index query latency thread socket parser '
+                 'template session token request response worker').split()
+        rng = random.Random(42)
+        project_ids, post_ids = [], []
+        for i in range(projects):
+            tech = rng.sample(['Python', 'Flask', 'SQLite', 'JavaScript', 'Go', 'Rust'], 3)
+            project = app.Project(
+                id=str(uuid.uuid4()), title=f'Project {i}',
+                description=' '.join(rng.choices(words, k=30)), tech=','.join(tech),
+                image=f'https://example.com/{i}.png', cover=f'https://example.com/{i}-cover.png',
+                source=f'https://github.com/example/project-{i}',
+                details=' '.join(rng.choices(words, k=300)))
+            if hasattr(project, 'set_tech'):  # Normalized tags
+                project.set_tech(tech)
+            app.db.session.add(project)
+            project_ids.append(project.id)
+            if i % 500 == 499:
+                app.db.session.commit()
+        for i in range(posts):
+            post = app.BlogPost(
+                id=str(uuid.uuid4()), title=f'Post {i}',
+                excerpt=' '.join(rng.choices(words, k=30)), date='2024-01-01',
+                category=rng.choice(['Security', 'Web', 'Tools']),
+                image=f'https://example.com/{i}.png', cover=f'https://example.com/{i}-cover.png',
+                read_time='5 min', content=' '.join(rng.choices(words, k=600)))
+            app.db.session.add(post)
+            post_ids.append(post.id)
+            if i % 500 == 499:
+                app.db.session.commit()
+        app.db.session.commit()
+    return emails, project_ids, post_ids
+
+
+def scenario_requests(name, emails, project_ids, post_ids, rng):
+    """(method, path, form) for one request of the scenario"""
+    if name == 'data_json':
+        return 'GET', '/data.json', None
+    if name == 'login':
+        return 'POST', '/login', {'email': rng.choice(emails), 'password': PASSWORD}
+    if name == 'publish':
+        return 'GET', '/publish', None
+    if name == 'project':
+        return 'GET', f'/api/project/{rng.choice(project_ids)}', None
+    return 'GET', f'/api/blog/{rng.choice(post_ids)}', None
+
+
+def expected_status(name):
+    # A successful login redirects; anything else (e.g. /publish bouncing a
+    # client that is not logged in to /login) counts as an error
+    return 302 if name == 'login' else 200
+
+
+def log_in(status, email):
+    if status != 302:
+        raise SystemExit(f'Could not log in as {email} (status {status})')
+
+
+def run_test_client(app, name, count, fixtures):
+    rng = random.Random(1)
+    client = app.app.test_client()
+    if name == 'publish':
+        email = fixtures[0][0]
+        log_in(client.post('/login', data={'email': email, 'password': PASSWORD}).status_code, email)
+    latencies, errors = [], 0
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    for _ in range(count):
+        method, path, form = scenario_requests(name, *fixtures, rng)
+        if name == 'login':
+            client = app.app.test_client()  # Logged-in clients are redirected before the password check
+        t = time.perf_counter()
+        response = client.open(path, method=method, data=form)
+        latencies.append(time.perf_counter() - t)
+        errors += response.status_code != expected_status(name)
+    return summarize(latencies, errors, time.perf_counter() - start, rss_before, current_rss_mb())
+
+
+def http_request(port, method, path, form=None, cookie=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    headers = {}
+    body = None
+    if form is not None:
+        body = urlencode(form)
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    if cookie:
+        headers['Cookie'] = cookie
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status, response.getheader('Set-Cookie')
+    finally:
+        conn.close()
+
+
+def run_server(port, name, count, concurrency, fixtures):
+    emails = fixtures[0]
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    remaining = [count]
+
+    cookies = [None] * concurrency
+    if name == 'publish':
+        for index in range(concurrency):
+            email = emails[index % len(emails)]
+            status, set_cookie = http_request(port, 'POST', '/login', {'email': email, 'password': PASSWORD})
+            log_in(status, email)
+            cookies[index] = set_cookie.split(';', 1)[0] if set_cookie else None
+
+    def client(index):
+        rng = random.Random(index)
+        cookie = cookies[index]
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            method, path, form = scenario_requests(name, *fixtures, rng)
+            t = time.perf_counter()
+            status, _ = http_request(port, method, path, form, cookie)
+            elapsed = time.perf_counter() - t
+            with lock:
+                latencies.append(elapsed)
+                errors[0] += status != expected_status(name)
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors[0], time.perf_counter() - start, rss_before, current_rss_mb())
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    directory = make_copy(args.source, None)
+    try:
+        os.chdir(directory)
+        sys.path.insert(0, directory)
+        os.environ.pop('DATABASE_URL', None)
+        os.environ['MAIL_QUEUE_WORKERS'] = '1'
+        if args.bcrypt_rounds:
+            os.environ['BCRYPT_LOG_ROUNDS'] = str(args.bcrypt_rounds)
+        import app
+        app.limiter.enabled = False
+
+        start = time.perf_counter()
+        fixtures = seed(app, args.users, args.projects, args.posts)
+        seed_seconds = time.perf_counter() - start
+
+        scenarios = [name for name in SCENARIOS if name in args.scenarios]
+        results = {'test_client': {}, 'server': {}}
+        for name in scenarios:
+            count = max(1, args.requests // 10) if name == 'login' else args.requests
+            results['test_client'][name] = run_test_client(app, name, count, fixtures)
+            print(f'test_client {name:<10} {format_result(results["test_client"][name])}')
+
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)  # No per-request access log
+        server = make_server('127.0.0.1', 0, app.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            for name in scenarios:
+                count = max(1, args.requests // 10) if name == 'login' else args.requests
+                results['server'][name] = run_server(server.port, name, count, args.concurrency, fixtures)
+                print(f'server      {name:<10} {format_result(results["server"][name])}')
+        finally:
+            server.shutdown()
+    finally:
+        os.chdir(HERE)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: getattr(args, key) for key in
+                   ('users', 'projects', 'posts', 'requests', 'concurrency', 'bcrypt_rounds')},
+        'seed_seconds': seed_seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results,
+    }
+
+
+def format_result(result):
+    return (f'p50 {result["p50_ms"]:8.2f} ms  p95 {result["p95_ms"]:8.2f} ms  '
+            f'p99 {result["p99_ms"]:8.2f} ms  {result["throughput_rps"]:8.1f} req/s  '
+            f'errors {result["errors"]}  rss {result["rss_after_mb"]:.0f} MB')
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    print(f'{old.get("commit")} -> {new.get("commit")}')
+    for mode, scenarios in new['results'].items():
+        for name, result in scenarios.items():
+            before = old['results'].get(mode, {}).get(name)
+            if not before:
+                continue
+            changes = []
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps'):
+                change = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+                changes.append(f'{key} {before[key]:8.2f} -> {result[key]:8.2f} ({change:+6.1f}%)')
+            print(f'{mode:<12} {name:<10} ' + '  '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=500, help='per scenario (login runs a tenth)')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads against the server')
+    parser.add_argument('--bcrypt-rounds', type=int, help='override BCRYPT_LOG_ROUNDS')
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument('--source', default=HERE, help='back end directory to benchmark')
+    parser.add_argument('--output', help='JSON results file (default: benchmarks/results/routes-<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two results files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args)
+    output = args.output or os.path.join(HERE, 'benchmarks', 'results',
+                                         f'routes-{report["commit"] or "unknown"}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
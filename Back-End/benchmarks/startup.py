@@ -0,0 +1,94 @@
+"""Worker cold-start time: importing app.py and serving the first request.
+
+Each run starts a fresh interpreter in a scratch copy of the back end, the
+way a new gunicorn worker would, then requests one page of /api/projects.
+"first boot" uses an empty instance folder
+(tables are created and data.json is imported); "warm boot" reuses one that
+has already been set up.
+
+Usage (from Back-End/):
+    python benchmarks/startup.py [--runs 5] [--source DIR] [--data ../Front-End/data.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = '''
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get('/api/projects?limit=1')
+served = time.perf_counter()
+print(json.dumps({'import': imported - start, 'first_request': served - imported,
+                  'status': response.status_code}))
+'''
+
+
+def make_copy(source, data):
+    target = tempfile.mkdtemp(prefix='startup-bench-')
+    shutil.copytree(source, target, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns('instance', '__pycache__', '.env', 'benchmarks'))
+    if data:
+        shutil.copy(data, os.path.join(target, 'data.json'))
+    return target
+
+
+def boot(directory):
+    env = dict(os.environ, PYTHONPATH=directory, MAIL_QUEUE_WORKERS='1')
+    env.pop('DATABASE_URL', None)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=directory, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process'] = time.perf_counter() - start
+    return result
+
+
+def summarize(name, results):
+    print(f'{name:<12}', end='')
+    for key in ('import', 'first_request', 'process'):
+        print(f'  {key} {statistics.median(r[key] for r in results) * 1000:8.1f} ms', end='')
+    print()
+    return {key: statistics.median(r[key] for r in results) for key in ('import', 'first_request', 'process')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--source', default=HERE, help='back end directory to benchmark')
+    parser.add_argument('--data', default=os.path.join(HERE, '..', 'Front-End', 'data.json'),
+                        help='data.json imported on first boot')
+    parser.add_argument('--json', help='also write the medians to this file')
+    args = parser.parse_args()
+    data = args.data if os.path.exists(args.data) else None
+
+    copies = []
+    try:
+        cold = []
+        for _ in range(args.runs):
+            copies.append(make_copy(args.source, data))
+            cold.append(boot(copies[-1]))
+        # The first copy has been set up now; boot it again as an existing worker would
+        warm = [boot(copies[0]) for _ in range(args.runs)]
+    finally:
+        for directory in copies:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    print(f'median of {args.runs} fresh interpreters')
+    medians = {'first boot': summarize('first boot', cold), 'warm boot': summarize('warm boot', warm)}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'runs': args.runs, 'medians': medians}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
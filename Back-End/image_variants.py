@@ -0,0 +1,51 @@
+"""Pillow helpers executed in the image process pool.
+
+These live outside app.py so pool workers, which are started through a
+forkserver rather than forked from the app, only import this module and
+Pillow. (When the app is started with `python app.py`, multiprocessing also
+imports app.py in the workers as their __main__.)
+"""
+import io
+import time
+
+from PIL import Image, ImageOps
+
+# Output format -> (Pillow format name, MIME type)
+FORMATS = {
+    'avif': ('AVIF', 'image/avif'),
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+}
+
+
+def supported_formats():
+    """Output formats this Pillow build can encode"""
+    Image.init()
+    return [name for name, (pil_format, _) in FORMATS.items() if pil_format in Image.SAVE]
+
+
+def make_variant(source, width, fmt, quality):
+    """Return (encoded image, seconds spent) for source scaled down to at most width pixels"""
+    start = time.perf_counter()
+    with Image.open(io.BytesIO(source)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        if fmt == 'jpeg' and has_alpha:
+            # JPEG has no alpha channel; flatten onto white like browsers render it
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image.convert('RGBA'), mask=image.convert('RGBA').getchannel('A'))
+            image = background
+        elif image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        output = io.BytesIO()
+        options = {'quality': quality}
+        if fmt == 'webp':
+            options['method'] = 4
+        elif fmt == 'jpeg':
+            options.update(optimize=True, progressive=True)
+        image.save(output, FORMATS[fmt][0], **options)
+    return output.getvalue(), time.perf_counter() - start
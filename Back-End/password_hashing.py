@@ -0,0 +1,35 @@
+"""bcrypt helpers executed in the password hashing process pool.
+
+These live outside app.py so pool workers, which are started through a
+forkserver rather than forked from the app, only import this module and
+bcrypt. (When the app is started with `python app.py`, multiprocessing also
+imports app.py in the workers as their __main__.)
+"""
+import time
+
+import bcrypt
+
+
+def hash_password(password, rounds):
+    """Return (hash, seconds spent hashing)"""
+    start = time.perf_counter()
+    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds))
+    return hashed.decode('utf-8'), time.perf_counter() - start
+
+
+def check_password(password_hash, password):
+    """Return (matches, seconds spent verifying)"""
+    start = time.perf_counter()
+    try:
+        matches = bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    except ValueError:
+        matches = False
+    return matches, time.perf_counter() - start
+
+
+def hash_rounds(password_hash):
+    """Work factor a bcrypt hash was created with, e.g. 12 for '$2b$12$...'"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
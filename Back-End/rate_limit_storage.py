@@ -0,0 +1,207 @@
+"""SQLite storage backend for Flask-Limiter.
+
+Importing this module registers the ``sqlite://`` scheme with the ``limits``
+library, so every gunicorn worker on the host can share one set of counters
+without running Redis::
+
+    Limiter(..., storage_uri='sqlite:////var/lib/app/ratelimit.db',
+            strategy='sliding-window-counter')
+
+The database runs in WAL mode, each hit is a single short IMMEDIATE
+transaction, and expired counters are swept in batches.
+"""
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+
+from limits.storage import MovingWindowSupport, SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+
+class SQLiteStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    STORAGE_SCHEME = ['sqlite']
+
+    SWEEP_INTERVAL = 60  # seconds between expired-key sweeps
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        # Same convention as SQLAlchemy: sqlite:///relative.db, sqlite:////absolute.db
+        self.path = uri[len('sqlite:///'):] or ':memory:'
+        self.timeout = float(options.get('timeout', 5))
+        self._local = threading.local()
+        self._last_sweep = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._create_schema()
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    @property
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _create_schema(self):
+        conn = self.connection
+        conn.execute('CREATE TABLE IF NOT EXISTS counters '
+                     '(key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_counters_expires_at ON counters (expires_at)')
+        conn.execute('CREATE TABLE IF NOT EXISTS events '
+                     '(key TEXT NOT NULL, atime REAL NOT NULL, expires_at REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_events_key_atime ON events (key, atime)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_events_expires_at ON events (expires_at)')
+
+    def _transaction(self):
+        conn = self.connection
+        conn.execute('BEGIN IMMEDIATE')
+        return conn
+
+    def _sweep(self, conn, now):
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        conn.execute('DELETE FROM counters WHERE expires_at <= ?', (now,))
+        conn.execute('DELETE FROM events WHERE expires_at <= ?', (now,))
+
+    def _incr(self, conn, key, expiry, amount, now):
+        return conn.execute(
+            'INSERT INTO counters (key, value, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET '
+            'value = CASE WHEN expires_at <= ? THEN excluded.value ELSE value + excluded.value END, '
+            'expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END '
+            'RETURNING value',
+            (key, amount, now + expiry, now, now)
+        ).fetchone()[0]
+
+    def _get(self, conn, key, now):
+        row = conn.execute('SELECT value FROM counters WHERE key = ? AND expires_at > ?',
+                           (key, now)).fetchone()
+        return row[0] if row else 0
+
+    # Fixed window
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        conn = self._transaction()
+        try:
+            value = self._incr(conn, key, expiry, amount, now)
+            self._sweep(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return value
+
+    def get(self, key):
+        return self._get(self.connection, key, time.time())
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self.connection.execute('SELECT expires_at FROM counters WHERE key = ? AND expires_at > ?',
+                                      (key, now)).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self.connection.execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        conn = self._transaction()
+        try:
+            count = conn.execute('DELETE FROM counters').rowcount
+            count += conn.execute('DELETE FROM events').rowcount
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return count
+
+    def clear(self, key):
+        conn = self._transaction()
+        try:
+            conn.execute('DELETE FROM counters WHERE key = ?', (key,))
+            conn.execute('DELETE FROM events WHERE key = ?', (key,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    # Moving window
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        conn = self._transaction()
+        try:
+            count = conn.execute('SELECT COUNT(*) FROM events WHERE key = ? AND atime > ?',
+                                 (key, now - expiry)).fetchone()[0]
+            acquired = count + amount <= limit
+            if acquired:
+                conn.executemany('INSERT INTO events (key, atime, expires_at) VALUES (?, ?, ?)',
+                                 [(key, now, now + expiry)] * amount)
+            self._sweep(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return acquired
+
+    def get_moving_window(self, key, limit, expiry):
+        now = time.time()
+        oldest, count = self.connection.execute(
+            'SELECT MIN(atime), COUNT(*) FROM events WHERE key = ? AND atime > ?',
+            (key, now - expiry)
+        ).fetchone()
+        return (oldest, count) if count else (now, 0)
+
+    # Sliding window counter
+
+    def _sliding_window_info(self, conn, key, expiry, now):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(conn, previous_key, now)
+        current_count = self._get(conn, current_key, now)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        conn = self._transaction()
+        try:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(conn, key, expiry, now)
+            acquired = floor(previous_count * previous_ttl / expiry + current_count) + amount <= limit
+            if acquired:
+                # The current window's counter also serves as the next window's previous one
+                _, current_key = self.sliding_window_keys(key, expiry, now)
+                self._incr(conn, current_key, 2 * expiry, amount, now)
+            self._sweep(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return acquired
+
+    def get_sliding_window(self, key, expiry):
+        return self._sliding_window_info(self.connection, key, expiry, time.time())
+
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
@@ -0,0 +1,340 @@
+"""Server-side sessions for Flask.
+
+The session cookie carries only an opaque random id and a version number;
+the session data lives in a store shared by every worker::
+
+    app.session_interface = ServerSideSessionInterface(
+        storage_from_uri('sqlite:////var/lib/app/sessions.db'))
+
+Stores are keyed by a SHA-256 digest of the session id, so a leaked store
+does not hand out live cookies. Each worker keeps recently used sessions in
+an LRU cache; an entry is only used while its version matches the cookie's,
+and every worker drops its cache whenever a session is deleted (logout, a
+new id on login) or a user's sessions are revoked.
+
+Sessions that only hold anonymous keys (the CSRF token, the chosen language,
+flash messages) are not stored at all: they travel in a signed cookie, like
+Flask's default sessions, so visitors and bots that never log in cost no
+writes. The first other key (e.g. user_id on login) moves the session to the
+store.
+
+Stores implement load/save/touch/delete/delete_user/generation:
+``sqlite:///path`` (WAL, shared between processes) and ``memory://`` (one
+process only).
+"""
+import hashlib
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from itsdangerous import BadSignature
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface, SessionInterface
+
+
+class ServerSideSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None, version=0, expires_at=None, stale=False):
+        super().__init__(initial)
+        self.sid = sid
+        self.version = version
+        self.expires_at = expires_at
+        self.regenerated = False
+        # The request sent a session cookie that matches no session (unknown,
+        # expired or badly signed); it is cleared unless replaced
+        self.stale = stale
+
+    def regenerate(self):
+        """Move the data to a new session id, e.g. on login, to prevent fixation"""
+        self.regenerated = True
+        self.modified = True
+
+
+class SQLiteSessionStore:
+    SWEEP_INTERVAL = 60  # seconds between expired-session sweeps
+    SWEEP_BATCH = 500  # rows deleted per sweep, so a backlog never stalls a request
+
+    def __init__(self, path, timeout=5):
+        self.path = path
+        self.timeout = timeout
+        # Touched whenever sessions are deleted so other processes drop their cached copies
+        self.stamp_path = path + '-revoked'
+        self._local = threading.local()
+        self._last_sweep = 0
+        self._create_schema()
+
+    @property
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _create_schema(self):
+        conn = self.connection
+        conn.execute('CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, user_id INTEGER, '
+                     'data TEXT NOT NULL, version INTEGER NOT NULL, expires_at REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_sessions_user_id ON sessions (user_id)')
+
+    def load(self, key, now):
+        """(data, version, expires_at) of a live session, or None"""
+        return self.connection.execute(
+            'SELECT data, version, expires_at FROM sessions WHERE id = ? AND expires_at > ?',
+            (key, now)).fetchone()
+
+    def save(self, key, user_id, data, version, expires_at):
+        conn = self.connection
+        conn.execute('INSERT INTO sessions (id, user_id, data, version, expires_at) VALUES (?, ?, ?, ?, ?) '
+                     'ON CONFLICT (id) DO UPDATE SET user_id = excluded.user_id, data = excluded.data, '
+                     'version = excluded.version, expires_at = excluded.expires_at',
+                     (key, user_id, data, version, expires_at))
+        self._sweep(conn)
+
+    def touch(self, key, expires_at):
+        self.connection.execute('UPDATE sessions SET expires_at = ? WHERE id = ?', (expires_at, key))
+
+    def delete(self, key):
+        self.connection.execute('DELETE FROM sessions WHERE id = ?', (key,))
+        self._bump_generation()
+
+    def delete_user(self, user_id):
+        count = self.connection.execute('DELETE FROM sessions WHERE user_id = ?', (user_id,)).rowcount
+        self._bump_generation()
+        return count
+
+    def _bump_generation(self):
+        with open(self.stamp_path, 'a'):
+            pass
+        # Strictly increasing, even for two deletions within the clock's resolution
+        now = max(time.time_ns(), self.generation() + 1)
+        os.utime(self.stamp_path, ns=(now, now))
+
+    def generation(self):
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _sweep(self, conn):
+        now = time.time()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        conn.execute('DELETE FROM sessions WHERE rowid IN '
+                     '(SELECT rowid FROM sessions WHERE expires_at <= ? LIMIT ?)', (now, self.SWEEP_BATCH))
+
+
+class MemorySessionStore:
+    """Sessions in a dict; only for a single process (tests, development)"""
+
+    def __init__(self):
+        self._sessions = {}  # key -> (user_id, data, version, expires_at)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def load(self, key, now):
+        row = self._sessions.get(key)
+        if row is None or row[3] <= now:
+            return None
+        return row[1:]
+
+    def save(self, key, user_id, data, version, expires_at):
+        with self._lock:
+            self._sessions[key] = (user_id, data, version, expires_at)
+            now = time.time()
+            for expired in [k for k, row in self._sessions.items() if row[3] <= now]:
+                del self._sessions[expired]
+
+    def touch(self, key, expires_at):
+        with self._lock:
+            row = self._sessions.get(key)
+            if row is not None:
+                self._sessions[key] = row[:3] + (expires_at,)
+
+    def delete(self, key):
+        with self._lock:
+            self._sessions.pop(key, None)
+            self._generation += 1
+
+    def delete_user(self, user_id):
+        with self._lock:
+            keys = [key for key, row in self._sessions.items() if row[0] == user_id]
+            for key in keys:
+                del self._sessions[key]
+            self._generation += 1
+        return len(keys)
+
+    def generation(self):
+        return self._generation
+
+
+def storage_from_uri(uri):
+    if uri == 'memory://':
+        return MemorySessionStore()
+    if uri.startswith('sqlite:///'):
+        # Same convention as SQLAlchemy: sqlite:///relative.db, sqlite:////absolute.db
+        return SQLiteSessionStore(uri[len('sqlite:///'):])
+    raise ValueError(f'Unsupported session storage URI: {uri}')
+
+
+class ServerSideSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+    # Marks a signed cookie-only session; never part of a session id or version
+    COOKIE_PREFIX = '~'
+
+    def __init__(self, store, cache_size=1024, touch_interval=3600,
+                 cookie_keys=('csrf_token', 'language', '_flashes')):
+        self.store = store
+        self.cache_size = cache_size
+        # Expiry is only pushed back in the store when it would move by this much
+        self.touch_interval = touch_interval
+        # Sessions holding nothing but these keys stay in a signed cookie
+        self.cookie_keys = frozenset(cookie_keys)
+        self._cookie_interface = SecureCookieSessionInterface()
+        self._cache = OrderedDict()  # key -> (version, data, expires_at)
+        self._cache_lock = threading.Lock()
+        self._generation = store.generation()
+
+    @staticmethod
+    def key(sid):
+        return hashlib.sha256(sid.encode('utf-8')).hexdigest()
+
+    def _cached(self, key, version, now):
+        generation = self.store.generation()
+        with self._cache_lock:
+            if generation != self._generation:
+                self._cache.clear()
+                self._generation = generation
+            entry = self._cache.get(key)
+            if entry is None or entry[0] != version or entry[2] <= now:
+                return None
+            self._cache.move_to_end(key)
+            return entry
+
+    def _remember(self, key, version, data, expires_at):
+        with self._cache_lock:
+            self._cache[key] = (version, data, expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _forget(self, key):
+        with self._cache_lock:
+            self._cache.pop(key, None)
+
+    def _open_cookie_session(self, app, value):
+        serializer = self._cookie_interface.get_signing_serializer(app)
+        if serializer is None:
+            return ServerSideSession()
+        try:
+            data = serializer.loads(value, max_age=int(app.permanent_session_lifetime.total_seconds()))
+        except BadSignature:
+            return ServerSideSession(stale=True)
+        return ServerSideSession(data)
+
+    def open_session(self, app, request):
+        value = request.cookies.get(self.get_cookie_name(app), '')
+        if value.startswith(self.COOKIE_PREFIX):
+            return self._open_cookie_session(app, value[len(self.COOKIE_PREFIX):])
+        if not value:
+            return ServerSideSession()
+        sid, _, version = value.partition('.')
+        if not sid or not version.isdigit():
+            return ServerSideSession(stale=True)
+        key = self.key(sid)
+        now = time.time()
+        entry = self._cached(key, int(version), now)
+        if entry is None:
+            row = self.store.load(key, now)
+            if row is None:
+                return ServerSideSession(stale=True)
+            data, stored_version, expires_at = row
+            entry = (stored_version, data, expires_at)
+            self._remember(key, *entry)
+        version, data, expires_at = entry
+        return ServerSideSession(self.serializer.loads(data), sid=sid, version=version, expires_at=expires_at)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.modified or session.stale:
+                if session.sid is not None:
+                    key = self.key(session.sid)
+                    self.store.delete(key)
+                    self._forget(key)
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+            return
+
+        if self.cookie_keys.issuperset(session.keys()) and (session.sid is None or session.modified):
+            if session.sid is not None:
+                # Only anonymous data left (e.g. a flash after logout): back to a cookie
+                key = self.key(session.sid)
+                self.store.delete(key)
+                self._forget(key)
+                session.sid = None
+            if session.modified or (session.permanent and self.should_set_cookie(app, session)):
+                value = self._cookie_interface.get_signing_serializer(app).dumps(dict(session))
+                response.set_cookie(name, self.COOKIE_PREFIX + value,
+                                    expires=self.get_expiration_time(app, session), httponly=httponly,
+                                    domain=domain, path=path, secure=secure, samesite=samesite)
+            return
+
+        now = time.time()
+        expires_at = now + app.permanent_session_lifetime.total_seconds()
+        if session.modified or session.sid is None:
+            if session.sid is not None and session.regenerated:
+                old_key = self.key(session.sid)
+                self.store.delete(old_key)
+                self._forget(old_key)
+                session.sid = None
+            if session.sid is None:
+                session.sid = secrets.token_urlsafe(32)
+                session.version = 0
+            session.version += 1
+            key = self.key(session.sid)
+            data = self.serializer.dumps(dict(session))
+            self.store.save(key, session.get('user_id'), data, session.version, expires_at)
+            self._remember(key, session.version, data, expires_at)
+        elif expires_at - session.expires_at >= self.touch_interval:
+            key = self.key(session.sid)
+            self.store.touch(key, expires_at)
+            with self._cache_lock:
+                entry = self._cache.get(key)
+                if entry is not None:
+                    self._cache[key] = entry[:2] + (expires_at,)
+            if not session.permanent:
+                return
+        else:
+            return
+
+        response.set_cookie(name, f'{session.sid}.{session.version}',
+                            expires=self.get_expiration_time(app, session), httponly=httponly,
+                            domain=domain, path=path, secure=secure, samesite=samesite)
+
+    def revoke_user(self, user_id):
+        """End every session of a user in all workers; returns how many there were"""
+        count = self.store.delete_user(user_id)
+        with self._cache_lock:
+            self._cache.clear()
+            self._generation = self.store.generation()
+        return count
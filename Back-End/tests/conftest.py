@@ -0,0 +1,109 @@
+"""Shared fixtures.
+
+The tests import a scratch copy of the back end so the database, the
+instance folder and every cache live in a temporary directory instead of
+the working tree.
+"""
+import http.server
+import os
+import shutil
+import sys
+import threading
+
+import pytest
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('backend'))
+    shutil.copytree(HERE, directory, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns('instance', '__pycache__', '.env', 'tests', 'benchmarks'))
+    database = os.path.join(directory, 'test.db')
+    os.environ.update({
+        'DATABASE_URL': 'sqlite:///' + database,
+        'DATABASE_READ_URL': f'sqlite:///file:{database}?mode=ro&uri=true',
+        'SESSION_STORAGE_URI': 'memory://',
+        'RATELIMIT_STORAGE_URI': 'memory://',
+        'BCRYPT_WORKERS': '0',
+        'BCRYPT_LOG_ROUNDS': '4',
+        'IMAGE_WORKERS': '0',
+    })
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    import app
+
+    app.app.config['WTF_CSRF_ENABLED'] = False
+    app.limiter.enabled = False
+    app.app.test_client().get('/api/projects?limit=1')  # Creates the database
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def user(app_module):
+    """A verified user, removed again after the test"""
+    with app_module.app.app_context():
+        user = app_module.User(username='tester', email='tester@example.com')
+        user.set_password('correct horse battery')
+        user.email_verified = True
+        app_module.db.session.add(user)
+        app_module.db.session.commit()
+        user_id = user.id
+    yield user_id
+    with app_module.app.app_context():
+        app_module.db.session.delete(app_module.db.session.get(app_module.User, user_id))
+        app_module.db.session.commit()
+
+
+@pytest.fixture
+def logged_in_client(client, user):
+    with client.session_transaction() as session:
+        session['user_id'] = user
+    return client
+
+
+class StubServer(http.server.ThreadingHTTPServer):
+    """Local HTTP server answering from a path -> (status, headers, body) table"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.routes = {}
+        self.requests = []  # (path, headers) of every request received
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers))
+        route = self.server.routes.get(self.path, (404, {}, b'Not found'))
+        if callable(route):
+            route = route(self)
+        status, headers, body = route
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_stub():
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
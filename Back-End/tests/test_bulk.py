@@ -0,0 +1,17 @@
+"""Bulk import/export access control."""
+import json
+
+
+def test_export_requires_login(client):
+    response = client.get('/api/export')
+    assert response.status_code in (302, 401)
+    if response.status_code == 302:
+        assert '/login' in response.headers['Location']
+    assert b'"type"' not in response.data
+
+
+def test_export_streams_ndjson_when_logged_in(logged_in_client):
+    response = logged_in_client.get('/api/export?type=project')
+    assert response.status_code == 200
+    for line in response.text.splitlines():
+        assert json.loads(line)['type'] == 'project'
@@ -0,0 +1,87 @@
+"""SQLite in WAL mode: readers on the read bind keep going while writers commit."""
+import threading
+import time
+import uuid
+
+from sqlalchemy import event
+
+DURATION = 2  # seconds
+HOLD = 0.2  # seconds each write transaction stays open
+READERS = 4
+WRITERS = 2
+
+
+def test_concurrent_reads_and_writes_do_not_lock(app_module):
+    db = app_module.db
+    with app_module.app.app_context():
+        assert db.session.execute(db.text('PRAGMA journal_mode')).scalar().lower() == 'wal'
+        read_engine = db.engines['read']
+
+    read_statements = [0]
+
+    def count_read(*args):
+        read_statements[0] += 1
+
+    event.listen(read_engine, 'before_cursor_execute', count_read)
+    stop = threading.Event()
+    errors = []
+    reads = [0]
+    writes = [0]
+    created = []
+    lock = threading.Lock()
+
+    def writer():
+        with app_module.app.app_context():
+            while not stop.is_set():
+                project_id = str(uuid.uuid4())
+                try:
+                    db.session.add(app_module.Project(
+                        id=project_id, title='Concurrent', description='Written during reads', tech='',
+                        image='', cover='', source='', details=''))
+                    db.session.flush()
+                    time.sleep(HOLD)  # Keep the write transaction open
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    with lock:
+                        errors.append(f'write: {e}')
+                else:
+                    with lock:
+                        writes[0] += 1
+                        created.append(project_id)
+                finally:
+                    db.session.remove()
+
+    def reader():
+        client = app_module.app.test_client()
+        while not stop.is_set():
+            # A fresh page size each time so no response cache answers instead of the database
+            with lock:
+                reads[0] += 1
+                limit = reads[0] % 50 + 1
+            for path in (f'/api/projects?limit={limit}', f'/api/blog-posts?limit={limit}'):
+                response = client.get(path)
+                if response.status_code != 200 or b'locked' in response.data:
+                    with lock:
+                        errors.append(f'read {path}: {response.status_code} {response.data[:200]!r}')
+
+    threads = ([threading.Thread(target=writer) for _ in range(WRITERS)]
+               + [threading.Thread(target=reader) for _ in range(READERS)])
+    try:
+        for thread in threads:
+            thread.start()
+        time.sleep(DURATION)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        event.remove(read_engine, 'before_cursor_execute', count_read)
+        with app_module.app.app_context():
+            for project_id in created:
+                db.session.delete(db.session.get(app_module.Project, project_id))
+            db.session.commit()
+
+    assert errors == []
+    assert writes[0] >= WRITERS
+    assert reads[0] > writes[0]
+    assert read_statements[0] > 0  # The listings really went to the read bind
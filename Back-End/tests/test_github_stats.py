@@ -0,0 +1,90 @@
+"""/api/github-stats against a stub of the GitHub API."""
+import json
+import os
+import time
+
+import pytest
+
+ORIGIN = 'https://yasserbdj96.github.io'
+PROFILE = {'login': 'yasserbdj96', 'name': 'Yasser', 'html_url': 'https://github.com/yasserbdj96',
+           'avatar_url': 'https://avatars.example/1', 'public_repos': 42, 'public_gists': 3,
+           'followers': 100, 'following': 7, 'email': 'not-exposed@example.com'}
+ETAG = '"profile-v1"'
+
+
+def profile_route(handler):
+    if handler.headers.get('If-None-Match') == ETAG:
+        return 304, {'ETag': ETAG}, b''
+    return 200, {'ETag': ETAG, 'Content-Type': 'application/json'}, json.dumps(PROFILE).encode('utf-8')
+
+
+@pytest.fixture
+def github(app_module, http_stub, monkeypatch):
+    """Points the back end at the stub, with no stored stats"""
+    monkeypatch.setitem(app_module.app.config, 'GITHUB_API_URL', http_stub.url)
+    monkeypatch.setitem(app_module.app.config, 'GITHUB_STATS_RETRY', 0)
+    http_stub.routes['/users/yasserbdj96'] = profile_route
+    with app_module._github_fetch_lock:
+        if os.path.exists(app_module.GITHUB_STATS_FILE):
+            os.remove(app_module.GITHUB_STATS_FILE)
+        app_module._github_stats = app_module._github_stats_mtime = None
+        app_module._github_retry_at = 0
+    return http_stub
+
+
+def make_stale(app_module):
+    entry = app_module.load_github_stats()
+    app_module.save_github_stats(dict(entry, fetched_at=time.time() - 2 * app_module.app.config['GITHUB_STATS_TTL']))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_stats_are_served_with_cors_header(client, github):
+    response = client.get('/api/github-stats', headers={'Origin': ORIGIN})
+
+    assert response.status_code == 200
+    assert response.headers['Access-Control-Allow-Origin'] == ORIGIN
+    assert response.json['stale'] is False
+    assert response.json['stats']['public_repos'] == 42
+    assert 'email' not in response.json['stats']
+
+    other = client.get('/api/github-stats', headers={'Origin': 'https://elsewhere.example'})
+    assert 'Access-Control-Allow-Origin' not in other.headers
+    assert len(github.requests) == 1  # Both answered from the stored copy
+
+
+def test_stale_stats_are_revalidated_with_the_etag(app_module, client, github):
+    first = client.get('/api/github-stats')
+    assert client.get('/api/github-stats', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    make_stale(app_module)
+    assert client.get('/api/github-stats').json['stale'] is True  # Served while the refresh runs
+
+    assert wait_for(lambda: len(github.requests) == 2)
+    assert github.requests[1][1]['If-None-Match'] == ETAG
+    assert wait_for(lambda: client.get('/api/github-stats').json['stale'] is False)
+    assert client.get('/api/github-stats').json['stats'] == first.json['stats']
+
+
+def test_stale_copy_is_served_when_github_is_gone(app_module, client, github, monkeypatch):
+    stats = client.get('/api/github-stats').json['stats']
+    github.shutdown()
+    github.server_close()
+    monkeypatch.setitem(app_module.app.config, 'GITHUB_STATS_RETRY', 60)
+    make_stale(app_module)
+
+    response = client.get('/api/github-stats')
+    assert response.status_code == 200
+    assert response.json['stale'] is True
+    assert response.json['stats'] == stats
+
+    assert wait_for(lambda: app_module._github_retry_at > time.time())  # The refresh failed
+    response = client.get('/api/github-stats')
+    assert response.status_code == 200
+    assert response.json['stale'] is True
+    assert response.json['stats'] == stats
@@ -0,0 +1,151 @@
+"""Outbox delivery against a local SMTP sink."""
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask_mail import Message
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Just enough SMTP for smtplib: records messages, can reject DATA with a 451"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.messages = []
+        self.failures = 0  # How many of the next messages to reject; -1 rejects all
+        self.connections = 0
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self.server.connections += 1
+        try:
+            self.converse()
+        finally:
+            self.server.connections -= 1
+
+    def converse(self):
+        self.reply('220 sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 sink')
+            elif command == 'DATA':
+                self.reply('354 end with .')
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b'.\r\n', b'.\n', b''):
+                        break
+                    lines.append(data)
+                if self.server.failures:
+                    self.server.failures -= self.server.failures > 0
+                    self.reply('451 try again later')
+                else:
+                    self.server.messages.append(b''.join(lines).decode('utf-8', 'replace'))
+                    self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+@pytest.fixture
+def sink(app_module, monkeypatch):
+    server = SMTPSink()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state = app_module.app.extensions['mail']
+    monkeypatch.setattr(state, 'server', '127.0.0.1')
+    monkeypatch.setattr(state, 'port', server.server_address[1])
+    monkeypatch.setattr(state, 'use_tls', False)
+    monkeypatch.setattr(state, 'use_ssl', False)
+    monkeypatch.setattr(state, 'username', None)
+    monkeypatch.setattr(state, 'suppress', False)
+    monkeypatch.setitem(app_module.app.config, 'MAIL_RETRY_BACKOFF', 0)
+    monkeypatch.setitem(app_module.app.config, 'MAIL_CONNECTION_IDLE', 0)
+    with app_module.app.app_context():
+        app_module.MailOutbox.query.delete()
+        app_module.db.session.commit()
+    yield server
+    # Workers keep their SMTP connection open; let them hang up before the
+    # next test starts a new sink
+    assert wait_for(app_module, lambda: server.connections == 0)
+    server.shutdown()
+    server.server_close()
+
+
+def enqueue(app_module, subject):
+    with app_module.app.app_context():
+        return app_module.queue_mail(Message(subject, sender='noreply@example.com',
+                                             recipients=['someone@example.com'], body='Hello'))
+
+
+def outbox_row(app_module, entry_id):
+    with app_module.app.app_context():
+        entry = app_module.db.session.get(app_module.MailOutbox, entry_id)
+        row = None if entry is None else (entry.status, entry.attempts, entry.next_attempt_at, entry.last_error)
+        app_module.db.session.remove()
+        return row
+
+
+def wait_for(app_module, condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        app_module._mail_wakeup.set()  # Don't wait for the workers' idle poll
+        time.sleep(0.05)
+    return False
+
+
+def test_message_is_delivered_and_removed_from_outbox(app_module, sink):
+    entry_id = enqueue(app_module, 'Delivered')
+
+    assert wait_for(app_module, lambda: outbox_row(app_module, entry_id) is None)
+    assert len(sink.messages) == 1
+    assert 'Subject: Delivered' in sink.messages[0]
+
+
+def test_transient_failure_is_retried_after_backoff(app_module, sink, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'MAIL_RETRY_BACKOFF', 60)
+    sink.failures = 1
+    entry_id = enqueue(app_module, 'Retried')
+
+    assert wait_for(app_module, lambda: (outbox_row(app_module, entry_id) or ('', 0))[1] == 1)
+    status, attempts, next_attempt_at, last_error = outbox_row(app_module, entry_id)
+    assert status == 'pending'
+    assert '451' in last_error
+    assert next_attempt_at > datetime.utcnow() + timedelta(seconds=50)
+    assert sink.messages == []
+
+    # Pretend the backoff has elapsed
+    with app_module.app.app_context():
+        app_module.db.session.get(app_module.MailOutbox, entry_id).next_attempt_at = datetime.utcnow()
+        app_module.db.session.commit()
+    assert wait_for(app_module, lambda: outbox_row(app_module, entry_id) is None)
+    assert len(sink.messages) == 1
+
+
+def test_message_is_dead_lettered_after_max_attempts(app_module, sink, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'MAIL_MAX_ATTEMPTS', 3)
+    sink.failures = -1
+    entry_id = enqueue(app_module, 'Undeliverable')
+
+    assert wait_for(app_module, lambda: (outbox_row(app_module, entry_id) or ('',))[0] == 'failed')
+    status, attempts, next_attempt_at, last_error = outbox_row(app_module, entry_id)
+    assert attempts == 3
+    assert '451' in last_error
+    time.sleep(0.5)
+    assert outbox_row(app_module, entry_id)[1] == 3  # Never picked up again
+    assert sink.messages == []
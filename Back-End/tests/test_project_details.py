@@ -0,0 +1,120 @@
+"""Project details: Markdown cache and outbound URL checks."""
+import time
+import urllib.parse
+
+import pytest
+
+README = b'# Stub project\n\n<script>alert(1)</script>\n\n[home](javascript:alert(1))\n'
+
+
+@pytest.fixture
+def project(app_module):
+    """Creates a project whose details point at the given URL"""
+    created = []
+
+    def create(details):
+        with app_module.app.app_context():
+            project = app_module.Project(title='Stub', description='A stub project', tech='', image='',
+                                         cover='', source='', details=details)
+            project.set_tech([])
+            app_module.db.session.add(project)
+            app_module.db.session.commit()
+            created.append(project.id)
+            return project.id
+
+    yield create
+    with app_module.app.app_context():
+        for project_id in created:
+            app_module.db.session.delete(app_module.db.session.get(app_module.Project, project_id))
+        app_module.db.session.commit()
+
+
+@pytest.fixture
+def stub_allowed(app_module, http_stub, monkeypatch):
+    """Lets the back end fetch from the stub, which is otherwise refused for being on loopback"""
+    monkeypatch.setitem(app_module.app.config, 'DETAILS_ALLOWED_HOSTS', ['127.0.0.1'])
+    check_outbound_url = app_module.check_outbound_url
+
+    def check_except_stub(url, allowed_hosts):
+        if urllib.parse.urlsplit(url).port != http_stub.server_address[1]:
+            check_outbound_url(url, allowed_hosts)
+
+    monkeypatch.setattr(app_module, 'check_outbound_url', check_except_stub)
+    return http_stub
+
+
+def test_details_are_rendered_once_then_served_from_cache(app_module, client, stub_allowed, project,
+                                                          monkeypatch):
+    stub_allowed.routes['/cached/README.md'] = lambda handler: (
+        (304, {}, b'') if handler.headers.get('If-None-Match') == '"v1"'
+        else (200, {'ETag': '"v1"'}, README))
+    project_id = project(stub_allowed.url + '/cached/README.md')
+
+    first = client.get(f'/api/project/{project_id}/details.html')
+    assert first.status_code == 200
+    assert '<h1>Stub project</h1>' in first.text
+    assert '<script>' not in first.text
+    assert 'javascript:' not in first.text
+    assert first.headers['Content-Security-Policy'].startswith('sandbox')
+
+    second = client.get(f'/api/project/{project_id}/details.html')
+    assert second.text == first.text
+    assert len(stub_allowed.requests) == 1
+
+    # Once stale the cached copy is still served and revalidated in the background
+    monkeypatch.setitem(app_module.app.config, 'DETAILS_CACHE_TTL', 0)
+    third = client.get(f'/api/project/{project_id}/details.html')
+    assert third.text == first.text
+    deadline = time.monotonic() + 5
+    while len(stub_allowed.requests) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert stub_allowed.requests[1][1]['If-None-Match'] == '"v1"'
+
+
+def test_details_host_not_on_allowlist_is_not_fetched(app_module, client, http_stub, project):
+    http_stub.routes['/README.md'] = (200, {}, README)
+    details = http_stub.url + '/README.md'
+    project_id = project(details)
+
+    response = client.get(f'/api/project/{project_id}/details.html')
+    assert response.status_code == 200
+    assert 'Stub project' not in response.text  # The URL is rendered as text, not fetched
+    assert http_stub.requests == []
+
+    with pytest.raises(app_module.BlockedURLError, match='Host not allowed'):
+        app_module.check_outbound_url(details, ['github.com'])
+
+
+def test_redirect_off_the_allowlist_is_not_followed(app_module, client, stub_allowed, project):
+    stub_allowed.routes['/moved/README.md'] = (302, {'Location': 'http://internal.example/README.md'}, b'')
+    project_id = project(stub_allowed.url + '/moved/README.md')
+
+    response = client.get(f'/api/project/{project_id}/details.html')
+    assert response.status_code == 502
+    assert [path for path, _ in stub_allowed.requests] == ['/moved/README.md']
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/README.md',
+    'http://localhost/README.md',
+    'http://10.0.0.1/README.md',
+    'http://192.168.1.1/README.md',
+    'http://169.254.169.254/latest/meta-data',
+    'http://[::1]/README.md',
+    'http://[::ffff:127.0.0.1]/README.md',
+])
+def test_private_and_loopback_addresses_are_rejected(app_module, url):
+    host = urllib.parse.urlsplit(url).hostname
+    with pytest.raises(app_module.BlockedURLError, match='non-public address'):
+        app_module.check_outbound_url(url, [host])
+
+
+def test_stub_on_loopback_is_refused_even_when_allowlisted(app_module, client, http_stub, project,
+                                                           monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'DETAILS_ALLOWED_HOSTS', ['127.0.0.1'])
+    http_stub.routes['/README.md'] = (200, {}, README)
+    project_id = project(http_stub.url + '/README.md')
+
+    response = client.get(f'/api/project/{project_id}/details.html')
+    assert response.status_code == 502
+    assert http_stub.requests == []
@@ -0,0 +1,41 @@
+"""Session cookies that no longer match a session are cleared."""
+import pytest
+
+
+def session_cookie(app_module, response):
+    """The session Set-Cookie header of a response, or None"""
+    name = app_module.app.config['SESSION_COOKIE_NAME']
+    for header in response.headers.getlist('Set-Cookie'):
+        if header.startswith(name + '='):
+            return header
+    return None
+
+
+@pytest.mark.parametrize('value', ['unknown-session-id.3', 'not-a-session', '~bad.signature'])
+def test_stale_cookie_is_deleted(app_module, client, value):
+    client.set_cookie(app_module.app.config['SESSION_COOKIE_NAME'], value)
+
+    header = session_cookie(app_module, client.get('/api/projects?limit=1'))
+    assert header is not None
+    assert 'Max-Age=0' in header
+
+
+def test_stale_cookie_is_replaced_when_the_session_gets_data(app_module, client):
+    client.set_cookie(app_module.app.config['SESSION_COOKIE_NAME'], 'unknown-session-id.3')
+
+    header = session_cookie(app_module, client.get('/login'))  # Stores a CSRF token
+    assert header is not None
+    assert header.split('=', 1)[1].startswith(app_module.app.session_interface.COOKIE_PREFIX)
+    assert 'Max-Age=0' not in header
+
+
+def test_no_cookie_is_set_without_a_session(app_module, client):
+    assert session_cookie(app_module, client.get('/api/projects?limit=1')) is None
+
+
+def test_cookie_of_a_revoked_session_is_deleted(app_module, logged_in_client, user):
+    app_module.app.session_interface.revoke_user(user)
+
+    header = session_cookie(app_module, logged_in_client.get('/api/projects?limit=1'))
+    assert header is not None
+    assert 'Max-Age=0' in header
@@ -0,0 +1,31 @@
+"""/api/stream subscriber limits."""
+THREADED = {'wsgi.multithread': True}
+
+
+def test_single_threaded_worker_refuses_subscribers(client):
+    response = client.get('/api/stream')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '30'
+
+
+def test_failed_start_does_not_leak_a_slot(app_module, client, monkeypatch):
+    def fail():
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(app_module.stream_hub, 'start', fail)
+    clients = app_module.stream_hub.clients
+
+    response = client.get('/api/stream', environ_overrides=THREADED)
+    assert response.status_code == 500
+    assert app_module.stream_hub.clients == clients
+
+
+def test_closed_stream_frees_its_slot(app_module, client):
+    clients = app_module.stream_hub.clients
+
+    response = client.get('/api/stream', environ_overrides=THREADED, buffered=False)
+    assert response.status_code == 200
+    assert app_module.stream_hub.clients == clients + 1
+    assert next(response.response) == b'retry: 5000\n\n'
+    response.close()
+    assert app_module.stream_hub.clients == clients
@@ -0,0 +1,51 @@
+"""Page and card fragment caches."""
+import re
+from datetime import datetime
+
+from flask import render_template_string, session
+from flask_wtf.csrf import validate_csrf
+
+
+def test_uncached_response_gets_the_real_csrf_token(app_module):
+    view = app_module.cached_page(lambda: (render_template_string('<p>{{ csrf_token() }}</p>'), 404))
+
+    with app_module.app.test_request_context('/missing'):
+        response = view()
+        assert response.status_code == 404
+        body = response.get_data(as_text=True)
+        assert app_module.CSRF_PLACEHOLDER not in body
+        validate_csrf(body[len('<p>'):-len('</p>')])  # Raises if it is not this session's token
+
+
+def test_cached_page_gets_each_visitors_own_csrf_token(app_module):
+    tokens = []
+    for _ in range(2):  # A miss, then a hit, for two different visitors
+        client = app_module.app.test_client()
+        response = client.get('/login')
+        assert response.status_code == 200
+        token = re.search(r'name="csrf_token" value="([^"]+)"', response.text).group(1)
+        with client.session_transaction() as client_session:
+            raw_token = client_session['csrf_token']
+        with app_module.app.test_request_context():
+            session['csrf_token'] = raw_token
+            validate_csrf(token)  # Raises unless the token belongs to this visitor's session
+        tokens.append(token)
+    assert tokens[0] != tokens[1]
+
+
+def test_card_is_rendered_again_when_its_image_digest_changes(app_module, monkeypatch):
+    entry = app_module.Project(id='card-image-test', title='Card', description='A card', tech='',
+                               image='https://example.com/card.png', cover='', source='', details='',
+                               updated_at=datetime(2024, 1, 1))
+    digest = ['a' * 64]
+    monkeypatch.setattr(app_module, 'read_image_meta', lambda url: {'digest': digest[0]})
+
+    with app_module.app.test_request_context('/publish'):
+        first = app_module.render_card('project', entry)
+        assert f'v={"a" * 12}' in first
+        assert app_module.render_card('project', entry) is first  # Served from the cache
+
+        digest[0] = 'b' * 64  # The remote image changed, the entry did not
+        second = app_module.render_card('project', entry)
+        assert f'v={"b" * 12}' in second
+        assert f'v={"a" * 12}' not in second
@@ -36,22 +36,18 @@ async function tryLocalJSON(localPath, inlineFallback = {}) {
 async function loadData() {
     if (appData) return appData;
 
-    const inlineFallback = {}; // Add any inline fallback data if needed
-    
     try {
-            // Try remote first
-            try {
-                const response = await fetch('https://yasserbdj96.pythonanywhere.com/data.json');
-                if (!response.ok) throw new Error('Remote fetch failed: ' + response.status);
-                appData = await response.json();
-                return appData;
-            } catch (remoteError) {
-                console.warn('Remote fetch failed; trying local file.', remoteError);
-                // Try local file (parsed JSON)
-                const local = await tryLocalJSON('./data.json', inlineFallback);
+            // Try the exported local file first (written by `flask export-static`)
+            const local = await tryLocalJSON('./data.json', null);
+            if (local) {
                 appData = local;
                 return appData;
             }
+            // Fall back to the live API
+            const response = await fetch('https://yasserbdj96.pythonanywhere.com/data.json');
+            if (!response.ok) throw new Error('Remote fetch failed: ' + response.status);
+            appData = await response.json();
+            return appData;
     } catch (error) {
         console.error('Error loading data fallback:', error);
         return { projects: [], blogPosts: [] };
@@ -146,14 +142,45 @@ async function initProjects() {
     renderProjects(projects);
 }
 
+// Scaled-down copy of an entry image from the back end; the original is the fallback
+function imageVariant(entry, variant, original) {
+    return `src="https://yasserbdj96.pythonanywhere.com/img/${encodeURIComponent(entry.id)}/${variant}" ` +
+           `data-fallback="${escapeAttribute(original || '')}" loading="lazy"`;
+}
+
+// Swap a variant that failed to load for its original (error events don't bubble, so listen in the capture phase)
+document.addEventListener('error', (e) => {
+    const img = e.target;
+    if (img.tagName === 'IMG' && img.dataset.fallback) {
+        const fallback = img.dataset.fallback;
+        delete img.dataset.fallback;
+        img.src = fallback;
+    }
+}, true);
+
+function escapeAttribute(value) {
+    return String(value).replace(/&/g, '&amp;').replace(/"/g, '&quot;').replace(/'/g, '&#39;')
+        .replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+
+// Prerendered page of an entry (written by `flask export-static`), linked from its card title
+function entryPage(section, entry) {
+    return `${section}/${encodeURIComponent(entry.id)}.html`;
+}
+
+// Ctrl/Cmd/Shift-click on a card title opens the prerendered page instead of the modal
+function opensInNewTab(e) {
+    return e.target.closest('.card-link') && (e.ctrlKey || e.metaKey || e.shiftKey);
+}
+
 // Render projects
 function renderProjects(projects) {
     const grid = document.getElementById('projects-grid');
     grid.innerHTML = projects.map((project, index) => `
         <div class="project-card" data-index="${index}" data-tech="${(project.tech || []).join(',')}">
-            <img src="${project.image || project.cover}" alt="${project.title}" class="project-img">
+            <img ${imageVariant(project, 'card', project.image || project.cover)} alt="${project.title}" class="project-img">
             <div class="project-content">
-                <h3>${project.title}</h3>
+                <h3><a href="${entryPage('projects', project)}" class="card-link" style="color: inherit; text-decoration: none;">${project.title}</a></h3>
                 <p>${truncate(project.description, 120)}</p>
                 <div class="tech-tags">
                     ${(project.tech || []).map(t => `<span class="tech-tag">${t}</span>`).join('')}
@@ -163,7 +190,9 @@ function renderProjects(projects) {
     `).join('');
     
     document.querySelectorAll('.project-card').forEach(card => {
-        card.addEventListener('click', async () => {
+        card.addEventListener('click', async (e) => {
+            if (opensInNewTab(e)) return;
+            e.preventDefault();
             const index = card.dataset.index;
             await showProjectModal(index);
         });
@@ -191,7 +220,17 @@ async function showProjectModal(index) {
     
     let detailsHTML = '';
     
-    if (project.details && project.details.includes('github.com') && project.details.includes('/blob/') && project.details.endsWith('.md')) {
+    // Rendered and cached by the backend; fall back to rendering in the browser
+    try {
+        const response = await fetch(`https://yasserbdj96.pythonanywhere.com/api/project/${encodeURIComponent(project.id)}/details.html`);
+        if (response.ok) detailsHTML = await response.text();
+    } catch (error) {
+        console.warn('Rendered details unavailable; rendering locally.', error);
+    }
+    
+    if (detailsHTML) {
+        // Already rendered
+    } else if (project.details && project.details.includes('github.com') && project.details.includes('/blob/') && project.details.endsWith('.md')) {
         const rawUrl = project.details
             .replace('github.com', 'raw.githubusercontent.com')
             .replace('/blob/', '/');
@@ -210,7 +249,7 @@ async function showProjectModal(index) {
     }
     
     modalBody.innerHTML = `
-        <img src="${project.cover || project.image}" alt="${project.title}" style="width: 100%; border-radius: 10px; margin-bottom: 2rem;">
+        <img ${imageVariant(project, 'cover', project.cover || project.image)} alt="${project.title}" style="width: 100%; border-radius: 10px; margin-bottom: 2rem;">
         <h1>${project.title}</h1>
         <div class="tech-tags" style="margin: 1rem 0;">
             ${(project.tech || []).map(t => `<span class="tech-tag">${t}</span>`).join('')}
@@ -251,21 +290,23 @@ async function initBlog() {
     
     grid.innerHTML = posts.map((post, index) => `
         <div class="blog-card" data-index="${index}">
-            <img src="${post.image || post.cover}" alt="${post.title}" class="blog-img">
+            <img ${imageVariant(post, 'card', post.image || post.cover)} alt="${post.title}" class="blog-img">
             <div class="blog-content">
                 <div class="blog-meta">
                     <span class="blog-category"><i class="fas fa-tag"></i> ${post.category}</span>
                     <span><i class="fas fa-calendar"></i> ${post.date}</span>
                     <span><i class="fas fa-clock"></i> ${post.readTime}</span>
                 </div>
-                <h3>${post.title}</h3>
+                <h3><a href="${entryPage('blog', post)}" class="card-link" style="color: inherit; text-decoration: none;">${post.title}</a></h3>
                 <p>${truncate(post.excerpt, 120)}</p>
             </div>
         </div>
     `).join('');
     
     document.querySelectorAll('.blog-card').forEach(card => {
-        card.addEventListener('click', async () => {
+        card.addEventListener('click', async (e) => {
+            if (opensInNewTab(e)) return;
+            e.preventDefault();
             const index = card.dataset.index;
             await showBlogModal(index);
         });
@@ -282,7 +323,7 @@ async function showBlogModal(index) {
     const modalBody = document.getElementById('modal-body');
     
     modalBody.innerHTML = `
-        <img src="${post.cover || post.image}" alt="${post.title}" style="width: 100%; border-radius: 10px; margin-bottom: 2rem;">
+        <img ${imageVariant(post, 'cover', post.cover || post.image)} alt="${post.title}" style="width: 100%; border-radius: 10px; margin-bottom: 2rem;">
         <div class="blog-meta" style="margin-bottom: 1rem;">
             <span class="blog-category"><i class="fas fa-tag"></i> ${post.category}</span>
             <span><i class="fas fa-calendar"></i> ${post.date}</span>
@@ -301,20 +342,20 @@ async function initPricing() {
     const inlinePricing = []; // your inline fallback plans
     let plans = inlinePricing;
 
-    try {
-        // Try remote first
-        const resp = await fetch('https://yasserbdj96.pythonanywhere.com/pricing.json');
-        if (resp.ok) {
-            plans = await resp.json();
-        } else {
-            throw new Error('Remote pricing failed: ' + resp.status);
-        }
-    } catch (remoteErr) {
-        console.warn('Remote pricing failed, trying local pricing.json', remoteErr);
+    // Try the exported local file first, then the live API
+    const local = await tryLocalJSON('./pricing.json', null);
+    if (local) {
+        plans = local;
+    } else {
         try {
-            plans = await tryLocalJSON('./pricing.json', inlinePricing);
-        } catch (localErr) {
-            console.error('Local pricing also failed, using inline fallback', localErr);
+            const resp = await fetch('https://yasserbdj96.pythonanywhere.com/pricing.json');
+            if (resp.ok) {
+                plans = await resp.json();
+            } else {
+                throw new Error('Remote pricing failed: ' + resp.status);
+            }
+        } catch (remoteErr) {
+            console.error('Remote pricing also failed, using inline fallback', remoteErr);
             plans = inlinePricing;
         }
     }
@@ -429,11 +470,24 @@ if (currentYearEl) {
     currentYearEl.textContent = new Date().getFullYear();
 }
 
+// Load GitHub profile counters: cached by the back end, so visitors do not
+// hit GitHub's rate limit; fall back to GitHub itself if the back end is down
+async function loadGitHubProfile() {
+    try {
+        const response = await fetch('https://yasserbdj96.pythonanywhere.com/api/github-stats');
+        if (!response.ok) throw new Error('GitHub stats fetch failed: ' + response.status);
+        return (await response.json()).stats;
+    } catch (error) {
+        console.warn('Cached GitHub stats unavailable; asking GitHub directly.', error);
+        const response = await fetch('https://api.github.com/users/yasserbdj96');
+        return await response.json();
+    }
+}
+
 // Fetch GitHub stats
 async function fetchGitHubStats() {
     try {
-        const response = await fetch('https://api.github.com/users/yasserbdj96');
-        const data = await response.json();
+        const data = await loadGitHubProfile();
         
         const statsContainer = document.getElementById('github-stats');
         if (statsContainer) {